@@ -1,7 +1,13 @@
 """External service adapters."""
 
 from .browser import BrowserAdapter, PlaywrightBrowserAdapter, StubBrowserAdapter
-from .embeddings import BGEEmbeddingsAdapter, CachedEmbeddingsAdapter, EmbeddingsAdapter, StubEmbeddingsAdapter
+from .embeddings import (
+    BGEEmbeddingsAdapter,
+    CachedEmbeddingsAdapter,
+    EmbeddingsAdapter,
+    SemanticCachedEmbeddingsAdapter,
+    StubEmbeddingsAdapter,
+)
 from .llm import LLMAdapter, StubLLMAdapter
 from .vector_store import LanceDBVectorStoreAdapter, QdrantVectorStoreAdapter, StubVectorStoreAdapter, VectorStoreAdapter
 
@@ -9,5 +15,6 @@ __all__ = [
     'LLMAdapter', 'StubLLMAdapter',
     'VectorStoreAdapter', 'StubVectorStoreAdapter', 'LanceDBVectorStoreAdapter', 'QdrantVectorStoreAdapter',
     'BrowserAdapter', 'StubBrowserAdapter', 'PlaywrightBrowserAdapter',
-    'EmbeddingsAdapter', 'StubEmbeddingsAdapter', 'BGEEmbeddingsAdapter', 'CachedEmbeddingsAdapter'
+    'EmbeddingsAdapter', 'StubEmbeddingsAdapter', 'BGEEmbeddingsAdapter', 'CachedEmbeddingsAdapter',
+    'SemanticCachedEmbeddingsAdapter'
 ]
@@ -2,13 +2,25 @@
 
 import asyncio
 import re
+import threading
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Regex fallback used when selectolax is not installed
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 @dataclass
 class HtmlContent:
@@ -20,11 +32,46 @@ class HtmlContent:
 
 
 class BrowserAdapter(ABC):
-    """Abstract browser adapter interface."""
+    """Abstract browser adapter interface with per-domain politeness delay."""
+
+    def __init__(self,
+                 rate_limit_delay: float = 1.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize per-domain rate limiting."""
+        self.rate_limit_delay = rate_limit_delay
+        self._sleep = sleep
+        self._last_request_time: dict[str, float] = {}
+        self._rate_limit_lock = threading.Lock()
+
+    def _get_domain(self, url: str) -> str:
+        """Extract domain from URL."""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def _apply_rate_limit(self, domain: str) -> None:
+        """Apply rate limiting per domain.
+        
+        The request slot is reserved under a lock and the wait happens outside
+        it, so concurrent fetches to one domain queue up one interval apart.
+        """
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            last_time = self._last_request_time.get(domain)
+            start = now if last_time is None else max(now, last_time + self.rate_limit_delay)
+            self._last_request_time[domain] = start
+            
+        if start > now:
+            self._sleep(start - now)
 
     @abstractmethod
     def fetch(self, url: str, offline_mode: bool = False) -> HtmlContent:
-        """Fetch HTML content from URL."""
+        """Fetch HTML content from URL.
+        
+        Must be safe to call from several threads at once: LibrarianAgent
+        fetches pages concurrently and relies on the adapter for politeness.
+        Adapters that hit the network call ``self._apply_rate_limit`` with
+        the URL's domain before each request.
+        """
         pass
 
     @abstractmethod
@@ -39,19 +86,14 @@ class PlaywrightBrowserAdapter(BrowserAdapter):
     def __init__(self, 
                  user_agent: str = "Spec-to-Pack Studio Research Bot 1.0",
                  rate_limit_delay: float = 1.0,
-                 timeout_ms: int = 30000):
+                 timeout_ms: int = 30000,
+                 sleep: Callable[[float], None] = time.sleep):
         """Initialize with rate limiting and user agent."""
+        super().__init__(rate_limit_delay=rate_limit_delay, sleep=sleep)
         self.user_agent = user_agent
-        self.rate_limit_delay = rate_limit_delay
         self.timeout_ms = timeout_ms
-        self._last_request_time: dict[str, float] = {}
         self._robots_cache: dict[str, Optional[RobotFileParser]] = {}
         
-    def _get_domain(self, url: str) -> str:
-        """Extract domain from URL."""
-        parsed = urlparse(url)
-        return f"{parsed.scheme}://{parsed.netloc}"
-        
     def _check_robots_txt(self, url: str) -> bool:
         """Check if URL is allowed by robots.txt."""
         domain = self._get_domain(url)
@@ -76,18 +118,6 @@ class PlaywrightBrowserAdapter(BrowserAdapter):
             self._robots_cache[domain] = None
             return True
             
-    def _apply_rate_limit(self, domain: str) -> None:
-        """Apply rate limiting per domain."""
-        now = time.time()
-        last_time = self._last_request_time.get(domain, 0)
-        
-        time_since_last = now - last_time
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
-            time.sleep(sleep_time)
-            
-        self._last_request_time[domain] = time.time()
-
     def fetch(self, url: str, offline_mode: bool = False) -> HtmlContent:
         """Fetch HTML content from URL using Playwright."""
         # Offline mode guard
@@ -145,21 +175,31 @@ class PlaywrightBrowserAdapter(BrowserAdapter):
             )
             
     def extract(self, html_content: HtmlContent) -> str:
-        """Extract clean text from HTML using basic cleanup."""
+        """Extract clean text from HTML.
+
+        Uses selectolax's C DOM parser when available, otherwise falls back
+        to regex-based tag stripping.
+        """
         if not html_content.html:
             return ""
-            
-        # Remove script and style elements
-        text = re.sub(r'<script[^>]*>.*?</script>', '', html_content.html, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
+
+        if LexborHTMLParser is not None:
+            tree = LexborHTMLParser(html_content.html)
+            for node in tree.css('script, style'):
+                node.decompose()
+            text = tree.text(separator=' ')
+        else:
+            # Remove script and style elements
+            text = _SCRIPT_RE.sub('', html_content.html)
+            text = _STYLE_RE.sub('', text)
+
+            # Remove HTML tags
+            text = _TAG_RE.sub('', text)
+
         # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         text = text.strip()
-        
+
         return text
 
 
@@ -1,7 +1,11 @@
 """Embeddings adapters for semantic text processing."""
 
 import hashlib
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional
 
 
@@ -63,8 +67,9 @@ class BGEEmbeddingsAdapter(EmbeddingsAdapter):
     def encode_batch(self, texts: list[str]) -> list[list[float]]:
         """Encode multiple texts into embedding vectors."""
         model = self._load_model()
-        embeddings = model.encode(texts, normalize_embeddings=True)
-        return [emb.tolist() for emb in embeddings]
+        embeddings = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        # One bulk conversion of the (N, dim) array rather than one per row
+        return embeddings.tolist()
         
     @property 
     def dimension(self) -> int:
@@ -75,69 +80,218 @@ class BGEEmbeddingsAdapter(EmbeddingsAdapter):
 
 
 class CachedEmbeddingsAdapter(EmbeddingsAdapter):
-    """Embeddings adapter with hash-based caching."""
+    """Embeddings adapter with text-keyed caching."""
     
     def __init__(self, base_adapter: EmbeddingsAdapter, cache_size: int = 1000):
         """Initialize with base adapter and cache settings."""
         self.base_adapter = base_adapter
         self.cache_size = cache_size
-        self._cache = {}
-        
-    def _get_text_hash(self, text: str) -> str:
-        """Get hash key for text."""
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+        # Keyed on the text itself: str hashes are computed once and cached
+        # by Python, so no separate digest is needed per lookup. LRU ordered.
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def _lookup(self, text: str) -> Optional[list[float]]:
+        """Get a cached embedding, marking it most recently used."""
+        with self._lock:
+            embedding = self._cache.get(text)
+            if embedding is not None:
+                self._cache.move_to_end(text)
+            return embedding
+        
+    def _store(self, text: str, embedding: list[float]) -> None:
+        """Store an embedding, evicting the least recently used entry when full."""
+        with self._lock:
+            self._store_locked(text, embedding)
+            
+    def _store_locked(self, text: str, embedding: list[float]) -> None:
+        """Store an embedding; the caller must hold ``self._lock``."""
+        # Insert first, then trim: no separate membership probe is needed
+        self._cache[text] = embedding
+        self._cache.move_to_end(text)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
         
     def encode(self, text: str) -> list[float]:
         """Encode with caching."""
-        text_hash = self._get_text_hash(text)
-        
-        if text_hash in self._cache:
-            return self._cache[text_hash]
+        embedding = self._lookup(text)
+        if embedding is not None:
+            return embedding
             
         # Generate embedding using base adapter
         embedding = self.base_adapter.encode(text)
-        
-        # Store in cache with LRU eviction
-        if len(self._cache) >= self.cache_size:
-            # Remove oldest entry (simple FIFO for now)
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
-            
-        self._cache[text_hash] = embedding
+        self._store(text, embedding)
         return embedding
         
     def encode_batch(self, texts: list[str]) -> list[list[float]]:
         """Encode batch with caching."""
-        results = []
-        uncached_texts = []
-        uncached_indices = []
-        
-        # Check cache for each text
-        for i, text in enumerate(texts):
-            text_hash = self._get_text_hash(text)
-            if text_hash in self._cache:
-                results.append(self._cache[text_hash])
-            else:
-                results.append(None)  # Placeholder
-                uncached_texts.append(text)
-                uncached_indices.append(i)
-        
-        # Encode uncached texts in batch
+        # Check cache for each text; None is a placeholder for misses
+        with self._lock:
+            results = [self._cache.get(text) for text in texts]
+            for text, embedding in zip(texts, results, strict=True):
+                if embedding is not None:
+                    self._cache.move_to_end(text)
+        
+        # Encode each distinct uncached text once, in a single base batch
+        uncached_texts = list(dict.fromkeys(
+            text for text, embedding in zip(texts, results, strict=True) if embedding is None
+        ))
         if uncached_texts:
-            uncached_embeddings = self.base_adapter.encode_batch(uncached_texts)
+            uncached_embeddings = dict(zip(
+                uncached_texts, self.base_adapter.encode_batch(uncached_texts), strict=True
+            ))
+            
+            # Fill in results, then cache new entries under one lock acquisition
+            for i, embedding in enumerate(results):
+                if embedding is None:
+                    results[i] = uncached_embeddings[texts[i]]
+            with self._lock:
+                for text, embedding in uncached_embeddings.items():
+                    self._store_locked(text, embedding)
+        
+        return results
+        
+    @property
+    def dimension(self) -> int:
+        """Get embedding dimension from base adapter."""
+        return self.base_adapter.dimension
+
+
+class SemanticCachedEmbeddingsAdapter(EmbeddingsAdapter):
+    """Embeddings cache that also serves near-duplicate texts.
+    
+    Each text is first encoded with a cheap probe adapter (e.g. a small model)
+    and compared against the probe vectors of recently cached texts. If the
+    best cosine similarity reaches ``threshold`` the cached embedding from the
+    expensive base adapter is returned instead of re-encoding. Requires numpy.
+    """
+    
+    def __init__(self,
+                 base_adapter: EmbeddingsAdapter,
+                 probe_adapter: EmbeddingsAdapter,
+                 threshold: float = 0.97,
+                 cache_size: int = 1024):
+        """Initialize semantic cache.
+        
+        Args:
+            base_adapter: Adapter producing the embeddings that are returned
+            probe_adapter: Cheaper adapter used only to find near-duplicates
+            threshold: Minimum probe cosine similarity counted as a hit
+            cache_size: Entries kept; the oldest entry is overwritten when full
+        """
+        import numpy as np
+        
+        self.base_adapter = base_adapter
+        self.probe_adapter = probe_adapter
+        self.threshold = threshold
+        self.cache_size = cache_size
+        # Ring buffer of L2-normalized probe vectors and their base embeddings
+        self._probes = np.zeros((cache_size, probe_adapter.dimension), dtype=np.float32)
+        self._embeddings: list[Optional[list[float]]] = [None] * cache_size
+        self._texts: list[Optional[str]] = [None] * cache_size
+        self._slots: dict[str, int] = {}
+        self._count = 0
+        self._next_slot = 0
+        self._lock = threading.Lock()
+        
+    def _normalize(self, vectors: list[list[float]]):
+        """Stack probe vectors into an L2-normalized float32 matrix."""
+        import numpy as np
+        
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+        
+    def _lookup_similar_locked(self, probe) -> Optional[list[float]]:
+        """Find a near-duplicate cached embedding; caller holds the lock."""
+        if self._count == 0:
+            return None
+            
+        similarities = self._probes[:self._count] @ probe
+        best = int(similarities.argmax())
+        if similarities[best] >= self.threshold:
+            return self._embeddings[best]
+        return None
+        
+    def _store_locked(self, text: str, probe, embedding: list[float]) -> None:
+        """Store an entry in the next ring slot; caller holds the lock."""
+        if text in self._slots:
+            return
             
-            # Fill in results and cache
-            for idx, embedding in zip(uncached_indices, uncached_embeddings):
-                results[idx] = embedding
-                text_hash = self._get_text_hash(texts[idx])
-                
-                # Store in cache with eviction
-                if len(self._cache) >= self.cache_size:
-                    oldest_key = next(iter(self._cache))
-                    del self._cache[oldest_key]
-                    
-                self._cache[text_hash] = embedding
+        slot = self._next_slot
+        evicted = self._texts[slot]
+        if evicted is not None:
+            del self._slots[evicted]
+            
+        self._probes[slot] = probe
+        self._embeddings[slot] = embedding
+        self._texts[slot] = text
+        self._slots[text] = slot
+        self._next_slot = (slot + 1) % self.cache_size
+        self._count = min(self._count + 1, self.cache_size)
+        
+    def encode(self, text: str) -> list[float]:
+        """Encode with exact and near-duplicate caching."""
+        return self.encode_batch([text])[0]
+        
+    def _group_near_duplicates(self, texts: list[str], probes: dict) -> dict[str, str]:
+        """Map each text to the first earlier text in ``texts`` it near-duplicates."""
+        import numpy as np
         
+        representatives: list[str] = []
+        groups = {}
+        for text in texts:
+            if representatives:
+                similarities = np.stack([probes[rep] for rep in representatives]) @ probes[text]
+                best = int(similarities.argmax())
+                if similarities[best] >= self.threshold:
+                    groups[text] = representatives[best]
+                    continue
+            representatives.append(text)
+            groups[text] = text
+        return groups
+        
+    def encode_batch(self, texts: list[str]) -> list[list[float]]:
+        """Encode batch, re-encoding only texts without a near-duplicate."""
+        # Exact repeats are served without running the probe adapter
+        with self._lock:
+            results = [
+                self._embeddings[slot] if (slot := self._slots.get(text)) is not None else None
+                for text in texts
+            ]
+        unseen = list(dict.fromkeys(
+            text for text, embedding in zip(texts, results, strict=True) if embedding is None
+        ))
+        if not unseen:
+            return results
+            
+        probes = dict(zip(
+            unseen, self._normalize(self.probe_adapter.encode_batch(unseen)), strict=True
+        ))
+        with self._lock:
+            similar = {text: self._lookup_similar_locked(probe) for text, probe in probes.items()}
+            # Near-duplicate hits are stored under their own text so repeats are exact
+            for text, embedding in similar.items():
+                if embedding is not None:
+                    self._store_locked(text, probes[text], embedding)
+            
+        # Near-duplicates within the batch share one base encoding
+        missing = [text for text, embedding in similar.items() if embedding is None]
+        if missing:
+            groups = self._group_near_duplicates(missing, probes)
+            representatives = list(dict.fromkeys(groups.values()))
+            encoded = dict(zip(
+                representatives, self.base_adapter.encode_batch(representatives), strict=True
+            ))
+            embeddings = {text: encoded[groups[text]] for text in missing}
+            with self._lock:
+                for text, embedding in embeddings.items():
+                    self._store_locked(text, probes[text], embedding)
+            similar.update(embeddings)
+            
+        for i, embedding in enumerate(results):
+            if embedding is None:
+                results[i] = similar[texts[i]]
         return results
         
     @property
@@ -149,37 +303,90 @@ class CachedEmbeddingsAdapter(EmbeddingsAdapter):
 class DualModelEmbeddingsAdapter(EmbeddingsAdapter):
     """Dual model embeddings adapter with query and content models."""
     
+    BACKENDS = ("torch", "onnx-int8")
+    ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+    
     def __init__(self, 
                  query_model: str = "BAAI/bge-small-en-v1.5",
                  content_model: str = "BAAI/bge-base-en-v1.5", 
-                 cache_dir: Optional[str] = None):
+                 cache_dir: Optional[str] = None,
+                 batch_size: int = 32,
+                 backend: str = "torch",
+                 embedding_cache_size: int = 2048):
         """Initialize dual model embeddings adapter.
         
         Args:
             query_model: Model for queries and tool calls (384d)
             content_model: Model for documents and content (768d)
             cache_dir: Cache directory for models
+            batch_size: Texts per forward pass when encoding batches
+            backend: "torch" (FP32) or "onnx-int8" for dynamically quantized
+                ONNX Runtime inference on CPU
+            embedding_cache_size: Texts per model kept in the single-text
+                embedding LRU cache (0 disables caching)
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown embeddings backend: {backend} (expected one of {', '.join(self.BACKENDS)})")
+            
         self.query_model_name = query_model
         self.content_model_name = content_model
         self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self.backend = backend
+        self.embedding_cache_size = embedding_cache_size
+        # Single-text embeddings keyed on raw text, LRU ordered
+        self._query_cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._content_cache: OrderedDict[str, list[float]] = OrderedDict()
         self._query_model = None
         self._content_model = None
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._query_dimension = None
         self._content_dimension = None
         
+    def _create_model(self, model_name: str):
+        """Create a sentence-transformers model for the configured backend."""
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError("DualModelEmbeddingsAdapter requires sentence-transformers. Install with: pip install 'studio[rag]'")
+            
+        if self.backend == "onnx-int8":
+            return self._create_quantized_model(SentenceTransformer, model_name)
+            
+        return SentenceTransformer(
+            model_name,
+            cache_folder=self.cache_dir
+        )
+        
+    def _create_quantized_model(self, model_cls, model_name: str):
+        """Load an int8 ONNX model, exporting and quantizing it on first use.
+        
+        The quantized export is saved under the cache directory so later loads
+        skip the ONNX export and quantization steps.
+        """
+        try:
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+        except ImportError:
+            raise ImportError("The onnx-int8 backend requires sentence-transformers with ONNX support. Install with: pip install 'studio[onnx]'")
+            
+        cache_root = Path(self.cache_dir) if self.cache_dir else Path.home() / ".cache" / "studio" / "embeddings"
+        save_dir = cache_root / "onnx-int8" / model_name.replace("/", "__")
+        
+        if not (save_dir / self.ONNX_INT8_FILE).exists():
+            model = model_cls(model_name, backend="onnx", cache_folder=self.cache_dir)
+            model.save(str(save_dir))
+            export_dynamic_quantized_onnx_model(model, "avx512_vnni", str(save_dir))
+            
+        return model_cls(
+            str(save_dir),
+            backend="onnx",
+            model_kwargs={"file_name": self.ONNX_INT8_FILE}
+        )
+        
     def _load_query_model(self):
         """Lazy load the query embeddings model."""
         if self._query_model is None:
-            try:
-                from sentence_transformers import SentenceTransformer
-            except ImportError:
-                raise ImportError("DualModelEmbeddingsAdapter requires sentence-transformers. Install with: pip install 'studio[rag]'")
-            
-            self._query_model = SentenceTransformer(
-                self.query_model_name,
-                cache_folder=self.cache_dir
-            )
+            self._query_model = self._create_model(self.query_model_name)
             
             # Determine dimension
             test_embedding = self._query_model.encode("test")
@@ -190,15 +397,7 @@ class DualModelEmbeddingsAdapter(EmbeddingsAdapter):
     def _load_content_model(self):
         """Lazy load the content embeddings model."""
         if self._content_model is None:
-            try:
-                from sentence_transformers import SentenceTransformer
-            except ImportError:
-                raise ImportError("DualModelEmbeddingsAdapter requires sentence-transformers. Install with: pip install 'studio[rag]'")
-            
-            self._content_model = SentenceTransformer(
-                self.content_model_name,
-                cache_folder=self.cache_dir
-            )
+            self._content_model = self._create_model(self.content_model_name)
             
             # Determine dimension
             test_embedding = self._content_model.encode("test")
@@ -206,29 +405,62 @@ class DualModelEmbeddingsAdapter(EmbeddingsAdapter):
         
         return self._content_model
     
+    def _encode_with(self, model, texts: list[str]) -> list[list[float]]:
+        """Encode texts in one batched forward pass and convert to lists once."""
+        embeddings = model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return embeddings.tolist()
+    
+    def _encode_cached(self, cache: OrderedDict, text: str, encode_batch) -> list[float]:
+        """Encode a single text, reusing the embedding if it was seen recently."""
+        embedding = cache.get(text)
+        if embedding is not None:
+            cache.move_to_end(text)
+            return embedding
+            
+        embedding = encode_batch([text])[0]
+        if self.embedding_cache_size > 0:
+            cache[text] = embedding
+            while len(cache) > self.embedding_cache_size:
+                cache.popitem(last=False)
+        return embedding
+    
     def encode_query(self, text: str) -> list[float]:
         """Encode query text using query model (384d)."""
-        model = self._load_query_model()
-        embedding = model.encode(text, normalize_embeddings=True)
-        return embedding.tolist()
+        return self._encode_cached(self._query_cache, text, self.encode_batch_queries)
         
     def encode_content(self, text: str) -> list[float]:
         """Encode content text using content model (768d)."""
-        model = self._load_content_model()
-        embedding = model.encode(text, normalize_embeddings=True)
-        return embedding.tolist()
+        return self._encode_cached(self._content_cache, text, self.encode_batch_content)
         
     def encode_batch_queries(self, texts: list[str]) -> list[list[float]]:
         """Encode multiple queries using query model."""
-        model = self._load_query_model()
-        embeddings = model.encode(texts, normalize_embeddings=True)
-        return [emb.tolist() for emb in embeddings]
+        return self._encode_with(self._load_query_model(), texts)
         
     def encode_batch_content(self, texts: list[str]) -> list[list[float]]:
         """Encode multiple content texts using content model."""
-        model = self._load_content_model()
-        embeddings = model.encode(texts, normalize_embeddings=True)
-        return [emb.tolist() for emb in embeddings]
+        return self._encode_with(self._load_content_model(), texts)
+    
+    def encode_pair_batches(self, queries: list[str], contents: list[str]) -> tuple[list[list[float]], list[list[float]]]:
+        """Encode a query batch and a content batch concurrently.
+        
+        The two models are independent and torch releases the GIL during
+        inference, so running them on separate threads overlaps their work.
+        
+        Returns:
+            Tuple of (query embeddings, content embeddings)
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dual-embeddings")
+            
+        query_future = self._pool.submit(self.encode_batch_queries, queries)
+        content_future = self._pool.submit(self.encode_batch_content, contents)
+        return query_future.result(), content_future.result()
     
     def encode(self, text: str) -> list[float]:
         """Default encode using content model for backward compatibility."""
@@ -271,24 +503,14 @@ class DualModelEmbeddingsAdapter(EmbeddingsAdapter):
         """
         import numpy as np
         
-        query_emb = np.array(self.encode_query(query))
-        content_emb = np.array(self.encode_content(content))
-        
-        # For cross-model similarity, we need to handle different dimensions
-        # Use a simple approach: pad or truncate to match dimensions
-        if len(query_emb) < len(content_emb):
-            # Pad query embedding to match content
-            padded_query = np.pad(query_emb, (0, len(content_emb) - len(query_emb)), 'constant')
-            similarity = np.dot(padded_query, content_emb) / (np.linalg.norm(padded_query) * np.linalg.norm(content_emb))
-        elif len(query_emb) > len(content_emb):
-            # Pad content embedding to match query
-            padded_content = np.pad(content_emb, (0, len(query_emb) - len(content_emb)), 'constant')
-            similarity = np.dot(query_emb, padded_content) / (np.linalg.norm(query_emb) * np.linalg.norm(padded_content))
-        else:
-            # Same dimensions
-            similarity = np.dot(query_emb, content_emb) / (np.linalg.norm(query_emb) * np.linalg.norm(content_emb))
-            
-        return float(similarity)
+        query_emb = np.asarray(self.encode_query(query), dtype=np.float32)
+        content_emb = np.asarray(self.encode_content(content), dtype=np.float32)
+        
+        # Both models emit L2-normalized embeddings, so cosine similarity is a
+        # plain dot product. Zero-padding the shorter vector would add nothing
+        # to it, so different dimensions compare over the shared leading ones.
+        dims = min(query_emb.shape[0], content_emb.shape[0])
+        return float(np.dot(query_emb[:dims], content_emb[:dims]))
 
 
 class StubEmbeddingsAdapter(EmbeddingsAdapter):
@@ -297,25 +519,35 @@ class StubEmbeddingsAdapter(EmbeddingsAdapter):
     def __init__(self, dimension: int = 384):
         self._dimension = dimension
         
+    def _digest(self, text: str) -> bytes:
+        """Get the hash bytes that seed a text's stub embedding."""
+        return hashlib.md5(text.encode('utf-8')).digest()
+        
     def encode(self, text: str) -> list[float]:
         """Return stub embedding based on text hash."""
-        # Create deterministic embedding from text hash
-        text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-        # Use hash to create pseudo-random but deterministic values
-        values = []
-        for i in range(self._dimension):
-            # Use modulo to cycle through the hash characters
-            hash_idx = (i * 2) % len(text_hash)
-            hex_chars = text_hash[hash_idx:hash_idx + 2]
-            if len(hex_chars) < 2:
-                hex_chars = text_hash[hash_idx] + text_hash[0]  # Wrap around if needed
-            byte_val = int(hex_chars, 16)
-            values.append((byte_val - 128) / 128.0)  # Normalize to [-1, 1]
-        return values
+        # Create deterministic embedding from text hash: each hash byte is
+        # normalized to [-1, 1] and the sequence repeats to fill the dimension
+        base = [(byte_val - 128) / 128.0 for byte_val in self._digest(text)]
+        repeats = -(-self._dimension // len(base))
+        return (base * repeats)[:self._dimension]
         
     def encode_batch(self, texts: list[str]) -> list[list[float]]:
         """Return stub embeddings for batch."""
-        return [self.encode(text) for text in texts]
+        try:
+            import numpy as np
+        except ImportError:
+            return [self.encode(text) for text in texts]
+            
+        if not texts:
+            return []
+            
+        # Normalize every digest byte in one vectorized pass, then tile each
+        # row with list repetition: the repeats reference the same 16 float
+        # objects instead of materializing a distinct float per element
+        digests = np.frombuffer(b''.join(self._digest(text) for text in texts), dtype=np.uint8)
+        bases = ((digests.reshape(len(texts), -1).astype(np.float64) - 128) / 128.0).tolist()
+        repeats = -(-self._dimension // len(bases[0]))
+        return [(base * repeats)[:self._dimension] for base in bases]
         
     @property
     def dimension(self) -> int:
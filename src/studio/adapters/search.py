@@ -1,5 +1,6 @@
 """Search adapters for retrieving web content and research data."""
 
+import hashlib
 import json
 import time
 from abc import ABC, abstractmethod
@@ -12,6 +13,9 @@ import requests
 class SearchResult:
     """Represents a single search result."""
     
+    # Adapters build many of these per query; slots avoid a __dict__ per instance
+    __slots__ = ('title', 'url', 'snippet', 'score', 'engine', 'category')
+    
     def __init__(self, title: str, url: str, snippet: str, score: float = 0.0, 
                  engine: str = "unknown", category: str = "general"):
         self.title = title
@@ -233,7 +237,8 @@ class FallbackSearchAdapter(SearchAdapter):
         
     def _check_primary_health(self) -> bool:
         """Check primary adapter health with caching."""
-        current_time = time.time()
+        # Monotonic so wall-clock adjustments cannot expire or extend the cache
+        current_time = time.monotonic()
         
         # Use cached result if recent
         if (self.primary_available is not None and 
@@ -287,6 +292,9 @@ class FallbackSearchAdapter(SearchAdapter):
             return "none"
 
 
+_STUB_SNIPPET_SUFFIX = " would contain relevant information about the query topic."
+
+
 class StubSearchAdapter(SearchAdapter):
     """Stub search adapter for testing and offline mode."""
     
@@ -304,17 +312,18 @@ class StubSearchAdapter(SearchAdapter):
             return []
             
         # Generate deterministic results based on query hash
-        import hashlib
         query_hash = hashlib.md5(query.encode('utf-8')).hexdigest()
         
+        # Only the result number varies between snippets
+        snippet_prefix = f"This is a stub search result for '{query}' in category '{category}'. Result "
+        
         results = []
         for i in range(min(limit, 3)):  # Return up to 3 stub results
             title_suffix = query_hash[i*2:i*2+2]
             results.append(SearchResult(
                 title=f"{query} - Resource {i+1} ({title_suffix})",
                 url=f"https://example.com/stub/{category}/{title_suffix}",
-                snippet=f"This is a stub search result for '{query}' in category '{category}'. " +
-                        f"Result {i+1} would contain relevant information about the query topic.",
+                snippet=f"{snippet_prefix}{i+1}{_STUB_SNIPPET_SUFFIX}",
                 score=float(limit - i),
                 engine="stub",
                 category=category
@@ -1,5 +1,8 @@
 """Vector store adapter for semantic search."""
 
+import heapq
+import json
+import operator
 import os
 import tempfile
 from abc import ABC, abstractmethod
@@ -7,8 +10,13 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True)
 class SearchResult:
     """Search result from vector store."""
     id: str
@@ -17,6 +25,39 @@ class SearchResult:
     metadata: dict[str, Any]
 
 
+def _dump_metadata(metadata: dict[str, Any]) -> str:
+    """Serialize metadata for the JSON string column, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(metadata)
+
+
+def _load_metadata(raw: str) -> dict[str, Any]:
+    """Parse a stored metadata column, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return json.loads(raw)
+
+
+def _batch_rows(doc_ids, embeddings, contents=None, metadatas=None):
+    """Zip index_many arguments into (doc_id, embedding, content, metadata) rows.
+    
+    Embeddings may be a list of vectors or a 2D array; arrays are converted
+    to lists once for the whole batch.
+    """
+    count = len(doc_ids)
+    if hasattr(embeddings, "tolist"):
+        embeddings = embeddings.tolist()
+    contents = [""] * count if contents is None else contents
+    metadatas = [None] * count if metadatas is None else metadatas
+    if not len(embeddings) == len(contents) == len(metadatas) == count:
+        raise ValueError("index_many needs one embedding, content and metadata entry per doc_id")
+    return [
+        (doc_id, embedding, content, metadata or {})
+        for doc_id, embedding, content, metadata in zip(doc_ids, embeddings, contents, metadatas, strict=True)
+    ]
+
+
 class VectorStoreAdapter(ABC):
     """Abstract vector store adapter interface."""
 
@@ -25,6 +66,12 @@ class VectorStoreAdapter(ABC):
         """Index a document with its embedding."""
         pass
 
+    def index_many(self, doc_ids: list[str], embeddings: list[list[float]], contents: list[str] = None,
+                   metadatas: list[dict[str, Any]] = None) -> None:
+        """Index several documents; adapters override this to write them in one batch."""
+        for doc_id, embedding, content, metadata in _batch_rows(doc_ids, embeddings, contents, metadatas):
+            self.index(doc_id, embedding, content, metadata)
+
     @abstractmethod
     def search(self, query_embedding: list[float], k: int = 10) -> list[SearchResult]:
         """Search for similar documents."""
@@ -91,13 +138,17 @@ class LanceDBVectorStoreAdapter(VectorStoreAdapter):
         
     def index(self, doc_id: str, embedding: list[float], content: str = "", metadata: dict[str, Any] = None) -> None:
         """Index a document with its embedding."""
-        import json
+        self.index_many([doc_id], [embedding], [content], [metadata])
+        
+    def index_many(self, doc_ids: list[str], embeddings: list[list[float]], contents: list[str] = None,
+                   metadatas: list[dict[str, Any]] = None) -> None:
+        """Index several documents with a single table write."""
         import pyarrow as pa
         
+        rows = _batch_rows(doc_ids, embeddings, contents, metadatas)
         table = self._get_table()
         
         # Prepare data
-        metadata = metadata or {}
         data = [{
             "id": doc_id,
             "vector": embedding,
@@ -106,8 +157,8 @@ class LanceDBVectorStoreAdapter(VectorStoreAdapter):
             "retrieved_at": metadata.get("retrieved_at", ""),
             "chunk_id": metadata.get("chunk_id", doc_id),
             "content_hash": metadata.get("content_hash", ""),
-            "metadata": json.dumps(metadata)
-        }]
+            "metadata": _dump_metadata(metadata)
+        } for doc_id, embedding, content, metadata in rows]
         
         # Convert to PyArrow table
         pa_table = pa.Table.from_pylist(data)
@@ -117,8 +168,6 @@ class LanceDBVectorStoreAdapter(VectorStoreAdapter):
         
     def search(self, query_embedding: list[float], k: int = 10) -> list[SearchResult]:
         """Search for similar documents."""
-        import json
-        
         try:
             table = self._get_table()
             
@@ -128,7 +177,7 @@ class LanceDBVectorStoreAdapter(VectorStoreAdapter):
             search_results = []
             for result in results:
                 try:
-                    metadata = json.loads(result.get("metadata", "{}"))
+                    metadata = _load_metadata(result.get("metadata", "{}"))
                 except json.JSONDecodeError:
                     metadata = {}
                     
@@ -203,6 +252,24 @@ class QdrantVectorStoreAdapter(VectorStoreAdapter):
             points=[point]
         )
         
+    def index_many(self, doc_ids: list[str], embeddings: list[list[float]], contents: list[str] = None,
+                   metadatas: list[dict[str, Any]] = None) -> None:
+        """Index several documents with a single upsert."""
+        from qdrant_client.models import PointStruct
+        
+        rows = _batch_rows(doc_ids, embeddings, contents, metadatas)
+        client = self._get_client()
+        
+        points = [
+            PointStruct(id=doc_id, vector=embedding, payload={**metadata, "content": content})
+            for doc_id, embedding, content, metadata in rows
+        ]
+        
+        client.upsert(
+            collection_name=self.collection_name,
+            points=points
+        )
+        
     def search(self, query_embedding: list[float], k: int = 10) -> list[SearchResult]:
         """Search for similar documents."""
         try:
@@ -239,30 +306,90 @@ class QdrantVectorStoreAdapter(VectorStoreAdapter):
 
 
 class StubVectorStoreAdapter(VectorStoreAdapter):
-    """Stub implementation for development/testing."""
+    """Stub implementation for development/testing.
+    
+    Documents are stored column-wise in parallel lists indexed by row, with
+    _documents mapping each doc_id to its row. Search scores every row by dot
+    product, as one float32 matrix-vector product when numpy is available.
+    The float32 matrix keeps spare rows and is synced incrementally, so a
+    search after a few writes converts only the rows written since the last one.
+    """
 
     def __init__(self):
-        self._documents = {}
+        self._documents: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._embeddings: list[list[float]] = []
+        self._contents: list[str] = []
+        self._metadata: list[dict[str, Any]] = []
+        self._matrix = None  # float32 rows of _embeddings plus spare capacity, built on first search
+        self._matrix_rows = 0  # leading rows of _matrix in sync with _embeddings
 
     def index(self, doc_id: str, embedding: list[float], content: str = "", metadata: dict[str, Any] = None) -> None:
         """Store document in memory (stub)."""
-        self._documents[doc_id] = {
-            "embedding": embedding,
-            "content": content,
-            "metadata": metadata or {}
-        }
+        row = self._documents.get(doc_id)
+        if row is None:
+            self._documents[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+            self._embeddings.append(embedding)
+            self._contents.append(content)
+            self._metadata.append(metadata or {})
+        else:
+            self._embeddings[row] = embedding
+            self._contents[row] = content
+            self._metadata[row] = metadata or {}
+            if row < self._matrix_rows:
+                try:
+                    self._matrix[row] = embedding
+                except ValueError:
+                    # Dimension changed; let the next search rebuild (and reject) it
+                    self._matrix = None
+                    self._matrix_rows = 0
 
     def search(self, query_embedding: list[float], k: int = 10) -> list[SearchResult]:
-        """Return stub search results."""
-        results = []
-        for doc_id, doc in list(self._documents.items())[:k]:
-            results.append(SearchResult(
-                id=doc_id,
-                score=0.85,  # Stub score
-                content=doc["content"],
-                metadata=doc["metadata"]
-            ))
-        return results
+        """Return the k documents with the highest dot product against the query."""
+        if not self._ids or k <= 0:
+            return []
+            
+        try:
+            import numpy as np
+        except ImportError:
+            scores = [sum(map(operator.mul, embedding, query_embedding)) for embedding in self._embeddings]
+            top = heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+        else:
+            scores = self._sync_matrix(np) @ np.asarray(query_embedding, dtype=np.float32)
+            if k < len(scores):
+                # Select the top k in linear time, then order just those
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top], kind="stable")]
+            else:
+                top = np.argsort(-scores, kind="stable")
+            top = top.tolist()
+            scores = scores.tolist()
+            
+        return [
+            SearchResult(
+                id=self._ids[row],
+                score=scores[row],
+                content=self._contents[row],
+                metadata=self._metadata[row]
+            )
+            for row in top
+        ]
+        
+    def _sync_matrix(self, np):
+        """Return the float32 embedding matrix, converting only rows added since the last search."""
+        count = len(self._embeddings)
+        if self._matrix is None:
+            self._matrix = np.asarray(self._embeddings, dtype=np.float32)
+        elif self._matrix_rows < count:
+            if len(self._matrix) < count:
+                # Grow geometrically so repeated index/search cycles copy O(n) rows overall
+                grown = np.empty((max(count, 2 * len(self._matrix)), self._matrix.shape[1]), dtype=np.float32)
+                grown[:self._matrix_rows] = self._matrix[:self._matrix_rows]
+                self._matrix = grown
+            self._matrix[self._matrix_rows:count] = self._embeddings[self._matrix_rows:count]
+        self._matrix_rows = count
+        return self._matrix[:count]
         
     def close(self) -> None:
         """Close stub vector store (no-op)."""
@@ -105,6 +105,9 @@ class FramerAgent(Agent):
 class LibrarianAgent(Agent):
     """Agent that fetches and indexes research content with RAG capabilities."""
 
+    # Concurrent page fetches per run; network-bound, so threads overlap the waits
+    MAX_FETCH_WORKERS = 4
+
     def __init__(self, search_adapter=None, browser_adapter=None, vector_store_adapter=None, embeddings_model=None, cache_manager=None, rag_logger=None):
         super().__init__("LibrarianAgent")
         self.search_adapter = search_adapter
@@ -116,13 +119,7 @@ class LibrarianAgent(Agent):
 
     def run(self, ctx: RunContext, spec: SourceSpec, blackboard: Blackboard) -> AgentOutput:
         """Fetch and index research content with RAG capabilities."""
-        import hashlib
-        import uuid
-        from datetime import datetime
-        
-        from ..types import ContentProvenance, ResearchDocument
-        
-        # Handle offline mode
+        # Handle offline mode before any adapter setup or imports
         if ctx.offline:
             if self.rag_logger:
                 self.rag_logger.research_pipeline_started(spec.meta.name, 0)
@@ -134,25 +131,26 @@ class LibrarianAgent(Agent):
                 status=Status.OK.value
             )
 
+        import hashlib
+        import uuid
+        from datetime import datetime
+        
+        from ..types import ContentProvenance, ResearchDocument
+        
         # Initialize adapters with defaults if none provided
         if self.search_adapter is None:
             from ..adapters.search import FallbackSearchAdapter
             self.search_adapter = FallbackSearchAdapter()
             
         if self.browser_adapter is None:
-            # Use PlaywrightBrowserAdapter by default, but fall back to stub in test environments
-            # or when offline mode is enabled
-            if ctx.offline:
+            # Use PlaywrightBrowserAdapter by default (offline runs returned above)
+            try:
+                from ..adapters.browser import PlaywrightBrowserAdapter
+                self.browser_adapter = PlaywrightBrowserAdapter()
+            except ImportError:
+                # Fallback to stub if playwright not available
                 from ..adapters.browser import StubBrowserAdapter
                 self.browser_adapter = StubBrowserAdapter()
-            else:
-                try:
-                    from ..adapters.browser import PlaywrightBrowserAdapter
-                    self.browser_adapter = PlaywrightBrowserAdapter()
-                except ImportError:
-                    # Fallback to stub if playwright not available
-                    from ..adapters.browser import StubBrowserAdapter
-                    self.browser_adapter = StubBrowserAdapter()
             
         if self.vector_store_adapter is None:
             from ..adapters.vector_store import StubVectorStoreAdapter
@@ -220,29 +218,37 @@ class LibrarianAgent(Agent):
             # Limit number of URLs to process (security guard)
             max_docs = min(10, len(unique_urls))  # Default limit
             
-            for i, url in enumerate(unique_urls[:max_docs]):
+            urls_to_process = unique_urls[:max_docs]
+            cached_docs = {}
+            urls_to_fetch = []
+            for url in urls_to_process:
                 try:
                     # Check cache first for scraped content
                     cached_doc = self.cache_manager.get_research_document(url)
-                    if cached_doc:
-                        research_docs.append(cached_doc)
+                except Exception:
+                    error_count += 1
+                    continue
+                if cached_doc:
+                    cached_docs[url] = cached_doc
+                elif url.startswith(('http://', 'https://')):
+                    # Basic URL validation
+                    urls_to_fetch.append(url)
+            
+            # Fetch concurrently; the browser adapter applies per-domain rate limits
+            fetched = self._fetch_all(urls_to_fetch, ctx.offline)
+            
+            for url in urls_to_process:
+                try:
+                    if url in cached_docs:
+                        research_docs.append(cached_docs[url])
                         fetched_count += 1
                         continue
-                    
-                    # Basic URL validation and rate limiting
-                    if not url.startswith(('http://', 'https://')):
+                    if url not in fetched:
                         continue
-                        
-                    # Add delay between requests (rate limiting)
-                    import time
-                    if i > 0:
-                        time.sleep(2.0)  # 2 second delay
-                    
-                    # Fetch content with browser adapter
-                    if self.rag_logger:
-                        self.rag_logger.web_fetch_started(url)
                     
-                    html_content = self.browser_adapter.fetch(url, offline_mode=ctx.offline)
+                    html_content = fetched[url]
+                    if isinstance(html_content, Exception):
+                        raise html_content
                     
                     if html_content and hasattr(html_content, 'status_code') and html_content.status_code == 200:
                         if self.rag_logger:
@@ -331,6 +337,29 @@ class LibrarianAgent(Agent):
                 status=Status.FAIL.value
             )
             
+    def _fetch_all(self, urls: list[str], offline: bool) -> dict:
+        """Fetch URLs concurrently with the browser adapter.
+        
+        Returns:
+            Dict mapping each URL to its fetched content, or to the exception
+            its fetch raised
+        """
+        def fetch(url):
+            if self.rag_logger:
+                self.rag_logger.web_fetch_started(url)
+            try:
+                return self.browser_adapter.fetch(url, offline_mode=offline)
+            except Exception as e:
+                return e
+                
+        if len(urls) <= 1:
+            return {url: fetch(url) for url in urls}
+            
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=min(self.MAX_FETCH_WORKERS, len(urls))) as pool:
+            return dict(zip(urls, pool.map(fetch, urls), strict=True))
+            
     def _generate_research_queries(self, spec: SourceSpec) -> list[str]:
         """Generate research queries based on the spec content."""
         queries = []
@@ -68,7 +68,7 @@ class AuditLog:
         if self.log_file.exists():
             with open(self.log_file) as f:
                 for line in f:
-                    if line.strip():
+                    if not line.isspace():  # Skip blank lines without copying
                         event_dict = json.loads(line)
                         # Convert back from serialized format
                         event_dict['timestamp'] = datetime.fromisoformat(
@@ -1,15 +1,71 @@
 """Multi-level research cache with TTL management."""
 
+import functools
 import hashlib
 import json
+import mmap
+import os
+import re
 import shutil
-from datetime import datetime, timedelta
+import threading
+from collections import Counter
+from datetime import date, datetime, time, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, Optional
+from uuid import UUID
 
 from ..types import ResearchDocument
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the non-JSON types orjson handles natively, the way orjson does."""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, 'tolist'):  # numpy arrays and scalars
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dump_entry(cache_entry: Dict[str, Any]) -> bytes:
+    """Serialize a cache entry to UTF-8 JSON, using orjson when available.
+    
+    Both branches accept the same inputs, so what gets cached does not
+    depend on whether the optional orjson dependency is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(cache_entry, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(cache_entry, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+# Entries at least this large are parsed from a read-only mapping instead of
+# being copied into a bytes object first; below it mmap setup costs more
+_MMAP_MIN_BYTES = 1 << 20
+
+
+def _read_entry(cache_path: Path) -> Dict[str, Any]:
+    """Read and parse a cache file, using orjson when available."""
+    with open(cache_path, 'rb', buffering=0) as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return orjson.loads(view)
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return json.loads(raw)
+
+
+# Entry files of the layout before level directories: <aa>/<bb>/<key>.json
+_FLAT_LAYOUT_GLOB = "[0-9a-f][0-9a-f]/[0-9a-f][0-9a-f]/*.json"
+_CACHE_FILE_RE = re.compile(r"[0-9a-f]{64}\.json")
+
 
 class CacheLevel(Enum):
     """Cache levels with different TTL settings."""
@@ -19,6 +75,27 @@ class CacheLevel(Enum):
     RESEARCH_DOCS = "research"     # 14 days
 
 
+@functools.lru_cache(maxsize=4096)
+def _hashed_cache_key(level: CacheLevel, identifier: str) -> str:
+    """Hash a level and identifier into a cache key.
+    
+    Memoized since a lookup and the store that follows a miss hash the
+    same identifier.
+    """
+    key_data = f"{level.value}:{identifier}"
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+def _lookup_stats(hits: int, misses: int) -> Dict[str, Any]:
+    """Summarize lookup outcomes; the hit ratio is 0.0 before any lookup."""
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / lookups if lookups else 0.0
+    }
+
+
 class ResearchCacheManager:
     """Multi-level cache manager for research data."""
     
@@ -34,6 +111,9 @@ class ResearchCacheManager:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Built once; every get/set starts from one of these
+        self._level_dirs = {level: self.cache_dir / level.value for level in CacheLevel}
+        
         # Cache TTL settings
         self.ttl_settings = {
             CacheLevel.SEARCH_RESULTS: timedelta(hours=24),
@@ -42,6 +122,11 @@ class ResearchCacheManager:
             CacheLevel.RESEARCH_DOCS: timedelta(days=14),
         }
         
+        # Lookup outcomes per level for this process, reported by cache_stats()
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        
     def _cache_key(self, level: CacheLevel, identifier: str) -> str:
         """Generate cache key from level and identifier.
         
@@ -52,20 +137,24 @@ class ResearchCacheManager:
         Returns:
             SHA-256 hash as cache key
         """
-        key_data = f"{level.value}:{identifier}"
-        return hashlib.sha256(key_data.encode()).hexdigest()
+        return _hashed_cache_key(level, identifier)
+        
+    def _level_dir(self, level: CacheLevel) -> Path:
+        """Get the directory holding all cache files of one level."""
+        return self._level_dirs[level]
         
-    def _cache_path(self, cache_key: str) -> Path:
+    def _cache_path(self, level: CacheLevel, cache_key: str) -> Path:
         """Get cache file path with directory structure.
         
         Args:
+            level: Cache level
             cache_key: Cache key hash
             
         Returns:
-            Path to cache file with 2-level directory structure
+            Path to cache file with 2-level directory structure under the level directory
         """
         # Create 2-level directory structure to avoid too many files in one dir
-        return self.cache_dir / cache_key[:2] / cache_key[2:4] / f"{cache_key}.json"
+        return self._level_dirs[level].joinpath(cache_key[:2], cache_key[2:4], f"{cache_key}.json")
         
     def get(self, level: CacheLevel, identifier: str) -> Optional[Dict[str, Any]]:
         """Get cached data if not expired.
@@ -77,15 +166,26 @@ class ResearchCacheManager:
         Returns:
             Cached data dict or None if not found/expired
         """
+        data = self._read_fresh(level, identifier)
+        
+        with self._stats_lock:
+            if data is None:
+                self._misses[level] += 1
+            else:
+                self._hits[level] += 1
+                
+        return data
+        
+    def _read_fresh(self, level: CacheLevel, identifier: str) -> Optional[Dict[str, Any]]:
+        """Read cached data, removing it if expired or corrupted."""
         cache_key = self._cache_key(level, identifier)
-        cache_path = self._cache_path(cache_key)
+        cache_path = self._cache_path(level, cache_key)
         
         if not cache_path.exists():
             return None
             
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = _read_entry(cache_path)
                 
             # Check expiration
             cached_at = datetime.fromisoformat(cache_data['cached_at'])
@@ -114,7 +214,7 @@ class ResearchCacheManager:
             True if cached successfully, False otherwise
         """
         cache_key = self._cache_key(level, identifier)
-        cache_path = self._cache_path(cache_key)
+        cache_path = self._cache_path(level, cache_key)
         
         try:
             # Ensure directory exists
@@ -130,8 +230,7 @@ class ResearchCacheManager:
             
             # Write cache file atomically
             temp_path = cache_path.with_suffix('.tmp')
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_entry, f, indent=2, ensure_ascii=False)
+            temp_path.write_bytes(_dump_entry(cache_entry))
             
             # Atomic rename
             temp_path.replace(cache_path)
@@ -155,6 +254,19 @@ class ResearchCacheManager:
         except OSError:
             pass
             
+    def migrate_layout(self) -> None:
+        """Remove entries left by the old layout without level directories.
+        
+        Those files sat at <cache_dir>/<aa>/<bb>/<key>.json and can no longer
+        be looked up. Only files matching that pattern are deleted, and their
+        shard directories only once empty. Run explicitly, e.g. by
+        ``studio cache cleanup``, rather than on every construction.
+        """
+        for cache_file in list(self.cache_dir.glob(_FLAT_LAYOUT_GLOB)):
+            shard = cache_file.parent.parent.name + cache_file.parent.name
+            if _CACHE_FILE_RE.fullmatch(cache_file.name) and cache_file.name.startswith(shard):
+                self._remove_cache_file(cache_file)
+                
     def clear_level(self, level: CacheLevel) -> int:
         """Clear all caches of specific level.
         
@@ -164,25 +276,15 @@ class ResearchCacheManager:
         Returns:
             Number of cache files cleared
         """
-        cleared = 0
+        level_dir = self._level_dir(level)
         
-        if not self.cache_dir.exists():
+        if not level_dir.exists():
             return 0
             
-        for cache_file in self.cache_dir.rglob("*.json"):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                    
-                if cache_data.get('cache_level') == level.value:
-                    self._remove_cache_file(cache_file)
-                    cleared += 1
-                    
-            except (json.JSONDecodeError, OSError):
-                # Remove corrupted files too
-                self._remove_cache_file(cache_file)
-                cleared += 1
-                
+        # Every file under the level directory belongs to that level, so
+        # nothing has to be opened to decide what to remove
+        cleared = sum(1 for _ in level_dir.rglob("*.json"))
+        shutil.rmtree(level_dir, ignore_errors=True)
         return cleared
         
     def clear_all(self) -> int:
@@ -213,92 +315,97 @@ class ResearchCacheManager:
         cleared = 0
         current_time = datetime.now()
         
-        if not self.cache_dir.exists():
-            return 0
+        for cache_level in CacheLevel:
+            ttl = self.ttl_settings[cache_level]
             
-        for cache_file in self.cache_dir.rglob("*.json"):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
+            # Listed up front since removals prune the directories being walked
+            for cache_file in list(self._level_dir(cache_level).rglob("*.json")):
+                try:
+                    cache_data = _read_entry(cache_file)
+                        
+                    # Check if expired
+                    cached_at = datetime.fromisoformat(cache_data['cached_at'])
                     
-                # Check if expired
-                cached_at = datetime.fromisoformat(cache_data['cached_at'])
-                cache_level = CacheLevel(cache_data['cache_level'])
-                ttl = self.ttl_settings[cache_level]
-                
-                if current_time - cached_at > ttl:
+                    if current_time - cached_at > ttl:
+                        self._remove_cache_file(cache_file)
+                        cleared += 1
+                        
+                except (json.JSONDecodeError, KeyError, ValueError, OSError):
+                    # Remove corrupted files
                     self._remove_cache_file(cache_file)
                     cleared += 1
                     
-            except (json.JSONDecodeError, KeyError, ValueError, OSError):
-                # Remove corrupted files
-                self._remove_cache_file(cache_file)
-                cleared += 1
-                
         return cleared
         
     def cache_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get cache statistics.
         
         Returns:
-            Statistics dict with counts and sizes per cache level
+            Statistics dict with counts and sizes per cache level, plus the
+            hits, misses and hit ratio of this manager's lookups
         """
         stats = {}
         total_files = 0
         total_size_mb = 0.0
         
+        with self._stats_lock:
+            hits = dict(self._hits)
+            misses = dict(self._misses)
+        total_lookups = _lookup_stats(sum(hits.values()), sum(misses.values()))
+        
         # Initialize stats for all levels
         for level in CacheLevel:
             stats[level.value] = {
                 'count': 0,
                 'size_mb': 0.0,
-                'expired': 0
+                'expired': 0,
+                **_lookup_stats(hits.get(level, 0), misses.get(level, 0))
             }
         
         if not self.cache_dir.exists():
-            stats['total'] = {'count': 0, 'size_mb': 0.0, 'expired': 0}
+            stats['total'] = {'count': 0, 'size_mb': 0.0, 'expired': 0, **total_lookups}
             return stats
             
         current_time = datetime.now()
         
-        for cache_file in self.cache_dir.rglob("*.json"):
-            try:
-                file_size_mb = cache_file.stat().st_size / 1024 / 1024
-                
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
+        for cache_level in CacheLevel:
+            level = cache_level.value
+            ttl = self.ttl_settings[cache_level]
+            
+            for cache_file in self._level_dir(cache_level).rglob("*.json"):
+                try:
+                    file_size_mb = cache_file.stat().st_size / 1024 / 1024
                     
-                level = cache_data.get('cache_level', 'unknown')
-                if level in stats:
+                    cache_data = _read_entry(cache_file)
+                        
                     stats[level]['count'] += 1
                     stats[level]['size_mb'] += file_size_mb
                     
                     # Check if expired
                     try:
                         cached_at = datetime.fromisoformat(cache_data['cached_at'])
-                        cache_level = CacheLevel(level)
-                        ttl = self.ttl_settings[cache_level]
                         
                         if current_time - cached_at > ttl:
                             stats[level]['expired'] += 1
                     except (KeyError, ValueError):
                         stats[level]['expired'] += 1
                         
-                total_files += 1
-                total_size_mb += file_size_mb
-                
-            except (json.JSONDecodeError, OSError):
-                total_files += 1
-                if 'unknown' not in stats:
-                    stats['unknown'] = {'count': 0, 'size_mb': 0.0, 'expired': 0}
-                stats['unknown']['count'] += 1
-                stats['unknown']['expired'] += 1
+                    total_files += 1
+                    total_size_mb += file_size_mb
+                    
+                except (json.JSONDecodeError, OSError):
+                    total_files += 1
+                    if 'unknown' not in stats:
+                        stats['unknown'] = {'count': 0, 'size_mb': 0.0, 'expired': 0}
+                    stats['unknown']['count'] += 1
+                    stats['unknown']['expired'] += 1
                 
         # Add total stats
         stats['total'] = {
             'count': total_files,
             'size_mb': total_size_mb,
-            'expired': sum(level_stats['expired'] for level_stats in stats.values() if 'expired' in level_stats)
+            'expired': sum(level_stats['expired'] for level_stats in stats.values() if 'expired' in level_stats),
+            **total_lookups
         }
         
         return stats
@@ -316,7 +423,7 @@ class ResearchCacheManager:
             return False
             
         identifier = doc.provenance.source_url
-        data = doc.model_dump()
+        data = doc.model_dump(mode="json")
         
         return self.set(CacheLevel.RESEARCH_DOCS, identifier, data)
         
@@ -399,21 +506,26 @@ class ResearchCacheManager:
         
         return None
         
-    def cache_embeddings(self, text: str, embedding: list[float], model_name: str) -> bool:
+    def cache_embeddings(self, text: str, embedding: list[float], model_name: str,
+                         text_hash: Optional[str] = None) -> bool:
         """Cache text embeddings.
         
         Args:
             text: Original text
             embedding: Embedding vector
             model_name: Name of the embedding model
+            text_hash: Precomputed MD5 hex digest of the text, if the caller
+                already has one
             
         Returns:
             True if cached successfully
         """
-        identifier = f"model:{model_name}:text_hash:{hashlib.md5(text.encode()).hexdigest()}"
+        if text_hash is None:
+            text_hash = hashlib.md5(text.encode()).hexdigest()
+        identifier = f"model:{model_name}:text_hash:{text_hash}"
         
         data = {
-            'text_hash': hashlib.md5(text.encode()).hexdigest(),
+            'text_hash': text_hash,
             'model_name': model_name,
             'embedding': embedding,
             'dimension': len(embedding)
@@ -421,17 +533,22 @@ class ResearchCacheManager:
         
         return self.set(CacheLevel.EMBEDDINGS, identifier, data)
         
-    def get_embeddings(self, text: str, model_name: str) -> Optional[list[float]]:
+    def get_embeddings(self, text: str, model_name: str,
+                       text_hash: Optional[str] = None) -> Optional[list[float]]:
         """Get cached embeddings.
         
         Args:
             text: Original text
             model_name: Name of the embedding model
+            text_hash: Precomputed MD5 hex digest of the text, if the caller
+                already has one
             
         Returns:
             Embedding vector if found, None otherwise
         """
-        identifier = f"model:{model_name}:text_hash:{hashlib.md5(text.encode()).hexdigest()}"
+        if text_hash is None:
+            text_hash = hashlib.md5(text.encode()).hexdigest()
+        identifier = f"model:{model_name}:text_hash:{text_hash}"
         data = self.get(CacheLevel.EMBEDDINGS, identifier)
         
         if data and 'embedding' in data:
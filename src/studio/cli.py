@@ -287,11 +287,12 @@ def clear(level):
 
 @cache.command()
 def cleanup():
-    """Clean up expired cache entries."""
+    """Clean up expired cache entries and entries in the old flat layout."""
     try:
         from .cache.research_cache import ResearchCacheManager
         
         cache_manager = ResearchCacheManager()
+        cache_manager.migrate_layout()
         cleaned = cache_manager.clear_expired()
         click.echo(f"Cleaned up {cleaned} expired cache entries")
         
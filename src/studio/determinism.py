@@ -5,6 +5,8 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+_DEFAULT_EXCLUDE_KEYS = frozenset({"generated_at"})
+
 
 class DeterminismUtils:
     """Utilities to ensure deterministic outputs."""
@@ -12,20 +14,26 @@ class DeterminismUtils:
     @staticmethod
     def normalize_json(data: dict[str, Any], exclude_keys: set = None) -> str:
         """Normalize JSON output with sorted keys and consistent formatting."""
-        if exclude_keys is None:
-            exclude_keys = {"generated_at"}
+        exclude_keys = _DEFAULT_EXCLUDE_KEYS if exclude_keys is None else frozenset(exclude_keys)
 
-        # Remove timestamp keys for comparison
-        normalized_data = {
-            k: v for k, v in data.items()
-            if k not in exclude_keys
-        }
+        # Remove timestamp keys for comparison; only the top level is filtered,
+        # so a shallow copy is needed and only when an excluded key is present
+        if exclude_keys.isdisjoint(data):
+            normalized_data = data
+        else:
+            normalized_data = {
+                k: v for k, v in data.items()
+                if k not in exclude_keys
+            }
 
         return json.dumps(normalized_data, sort_keys=True, indent=2, ensure_ascii=False)
 
     @staticmethod
     def ensure_lf_newlines(content: str) -> str:
         """Ensure LF newlines (Unix style) regardless of platform."""
+        # Most content is already LF-only; skip both copies when there is no CR
+        if '\r' not in content:
+            return content
         return content.replace('\r\n', '\n').replace('\r', '\n')
 
     @staticmethod
@@ -49,6 +57,9 @@ class DeterminismUtils:
         # Normalize newlines
         content = DeterminismUtils.ensure_lf_newlines(content)
 
+        # Set membership for the per-key checks in the nested removal
+        exclude_patterns = frozenset(exclude_patterns)
+
         # Handle JSON files
         if file_path.suffix == '.json':
             try:
@@ -64,7 +75,7 @@ class DeterminismUtils:
                 lines = content.strip().split('\n')
                 normalized_lines = []
                 for line in lines:
-                    if line.strip():  # Skip empty lines
+                    if line and not line.isspace():  # Skip empty lines without copying
                         data = json.loads(line)
                         data = DeterminismUtils._remove_nested_patterns(data, exclude_patterns)
                         normalized_lines.append(json.dumps(data, sort_keys=True, ensure_ascii=False))
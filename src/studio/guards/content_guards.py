@@ -1,15 +1,62 @@
 """Content security guards for RAG system."""
 
+import functools
+import re
+import threading
 import time
-from collections import defaultdict
-from typing import Dict, Optional, Set
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 
 from ..logging import RAGLogger
 
 
+@functools.lru_cache(maxsize=4096)
+def _extract_domain(url: str) -> str:
+    """Parse the ``scheme://netloc`` domain key for a URL (memoized)."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+# User-agent / Disallow directives, matched in one pass over the whole file
+_ROBOTS_RULE_RE = re.compile(
+    r'^[ \t]*(user-agent|disallow)[ \t]*:([^#\r\n]*)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def _parse_disallowed_paths(robots_txt: str) -> Tuple[str, ...]:
+    """Get the paths a robots.txt disallows for ``User-agent: *``."""
+    applies_to_all = False
+    disallowed_paths = []
+    
+    for directive, value in _ROBOTS_RULE_RE.findall(robots_txt):
+        value = value.strip()
+        if directive.lower() == 'user-agent':
+            applies_to_all = value == '*'
+        elif applies_to_all and value:
+            disallowed_paths.append(value)
+            
+    return tuple(disallowed_paths)
+
+
+@dataclass(slots=True)
+class _DomainState:
+    """Per-domain admission state, kept together so each check is one lookup."""
+    
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    request_count: int = 0
+    # Token bucket: None means full (the domain has not been rate limited yet)
+    tokens: Optional[float] = None
+    last_refill: float = 0.0
+
+
 class ContentGuard:
     """Security guard for content processing with limits and compliance checks."""
     
@@ -18,6 +65,10 @@ class ContentGuard:
                  max_doc_tokens: int = 8000,
                  max_docs_per_domain: int = 3,
                  rate_limit_delay: float = 2.0,
+                 burst: int = 1,
+                 robots_cache_ttl: float = 3600.0,
+                 robots_negative_cache_ttl: float = 300.0,
+                 max_robots_cache_entries: int = 512,
                  logger: Optional[RAGLogger] = None):
         """Initialize content guard.
         
@@ -26,18 +77,53 @@ class ContentGuard:
             max_doc_tokens: Maximum tokens per document (~6000 words)
             max_docs_per_domain: Maximum documents per domain
             rate_limit_delay: Delay between requests to same domain (seconds)
+            burst: Requests allowed back-to-back before rate limiting applies
+            robots_cache_ttl: Seconds before a domain's robots.txt is re-fetched
+            robots_negative_cache_ttl: Seconds a missing or unreachable
+                robots.txt is remembered before it is retried
+            max_robots_cache_entries: Domains kept in the robots.txt LRU cache
             logger: Optional RAG logger for structured logging
         """
         self.respect_robots_txt = respect_robots_txt
         self.max_doc_tokens = max_doc_tokens
         self.max_docs_per_domain = max_docs_per_domain
         self.rate_limit_delay = rate_limit_delay
+        self.burst = burst
+        self.robots_cache_ttl = robots_cache_ttl
+        self.robots_negative_cache_ttl = robots_negative_cache_ttl
+        self.max_robots_cache_entries = max_robots_cache_entries
         self.logger = logger
         
-        # Track requests per domain
-        self.domain_request_count: Dict[str, int] = defaultdict(int)
-        self.domain_last_request: Dict[str, float] = {}
-        self.robots_cache: Dict[str, bool] = {}
+        # Request counts, token buckets and locks per domain
+        self._domains: Dict[str, _DomainState] = {}
+        self._domains_guard = threading.Lock()
+        # Parsed robots.txt rules per domain: (disallowed_paths, expires_at), LRU ordered
+        self.robots_cache: OrderedDict[str, Tuple[Tuple[str, ...], float]] = OrderedDict()
+        self._robots_lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        
+    def _get_domain(self, url: str) -> str:
+        """Get the domain key used for per-domain limits."""
+        return _extract_domain(url)
+        
+    def _get_domain_state(self, domain: str) -> _DomainState:
+        """Get (creating on first use) the admission state for a domain."""
+        state = self._domains.get(domain)
+        if state is None:
+            with self._domains_guard:
+                state = self._domains.setdefault(domain, _DomainState())
+        return state
+        
+    @property
+    def domain_request_count(self) -> Mapping[str, int]:
+        """Read-only snapshot of successful fetches recorded per domain.
+        
+        Counts are updated through record_successful_fetch and cleared with
+        reset_domain_limits; assigning into the returned mapping raises TypeError.
+        """
+        with self._domains_guard:
+            domains = list(self._domains.items())
+        return MappingProxyType({domain: state.request_count for domain, state in domains})
         
     def check_url_allowed(self, url: str) -> bool:
         """Check if URL is allowed by robots.txt and domain limits.
@@ -51,15 +137,15 @@ class ContentGuard:
         Raises:
             ValueError: If URL exceeds domain limits or violates robots.txt
         """
-        parsed = urlparse(url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
+        domain = self._get_domain(url)
+        state = self._get_domain_state(domain)
         
         # Check domain request limits
-        if self.domain_request_count[domain] >= self.max_docs_per_domain:
+        if state.request_count >= self.max_docs_per_domain:
             if self.logger:
                 self.logger.content_guard_check(
                     url, "domain_limit", False, 
-                    {"current_count": self.domain_request_count[domain], 
+                    {"current_count": state.request_count, 
                      "limit": self.max_docs_per_domain}
                 )
             raise ValueError(f"Domain limit exceeded: {domain} (max {self.max_docs_per_domain})")
@@ -79,24 +165,54 @@ class ContentGuard:
     def check_rate_limit(self, url: str) -> None:
         """Check and enforce rate limiting for domain.
         
+        Each domain has a token bucket holding up to ``burst`` tokens that
+        refills at one token per ``rate_limit_delay`` seconds. Requests only
+        sleep once the bucket is empty, so idle domains are never delayed.
+        
         Args:
             url: URL being requested
         """
-        parsed = urlparse(url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
-        current_time = time.time()
-        
-        # Check if we need to wait
-        if domain in self.domain_last_request:
-            time_since_last = current_time - self.domain_last_request[domain]
-            if time_since_last < self.rate_limit_delay:
-                wait_time = self.rate_limit_delay - time_since_last
-                if self.logger:
-                    self.logger.rate_limit_triggered(domain, wait_time)
-                time.sleep(wait_time)
+        if self.rate_limit_delay <= 0:
+            return
+            
+        domain = self._get_domain(url)
         
-        # Update last request time
-        self.domain_last_request[domain] = time.time()
+        # Reserve a slot under the domain lock, then sleep without holding it so
+        # other domains (and later callers for this one) are never serialised
+        state = self._get_domain_state(domain)
+        with state.lock:
+            wait_time = self._reserve_request_slot(state)
+            
+        if wait_time > 0:
+            if self.logger:
+                self.logger.rate_limit_triggered(domain, wait_time)
+            time.sleep(wait_time)
+            
+    def _reserve_request_slot(self, state: _DomainState) -> float:
+        """Take a token from the domain's bucket and return the required wait.
+        
+        Must be called with ``state.lock`` held. When the bucket is empty the
+        refill time is pushed to the end of the wait, so concurrent callers
+        queue behind the reserved slot.
+        """
+        rate = 1.0 / self.rate_limit_delay
+        capacity = float(max(1, self.burst))
+        current_time = time.monotonic()
+        
+        # Refill tokens for the time elapsed since the last request
+        if state.tokens is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, state.tokens + (current_time - state.last_refill) * rate)
+        
+        if tokens >= 1:
+            state.tokens, state.last_refill = tokens - 1, current_time
+            return 0.0
+            
+        # Bucket empty: wait until one token has accumulated
+        wait_time = (1 - tokens) / rate
+        state.tokens, state.last_refill = 0.0, current_time + wait_time
+        return wait_time
         
     def record_successful_fetch(self, url: str) -> None:
         """Record successful fetch for domain counting.
@@ -104,9 +220,9 @@ class ContentGuard:
         Args:
             url: URL that was successfully fetched
         """
-        parsed = urlparse(url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
-        self.domain_request_count[domain] += 1
+        state = self._get_domain_state(self._get_domain(url))
+        with state.lock:
+            state.request_count += 1
         
     def check_content_size(self, content: str, url: str) -> str:
         """Check and truncate content if it exceeds size limits.
@@ -118,31 +234,38 @@ class ContentGuard:
         Returns:
             Potentially truncated content
         """
-        # Rough token estimation: 1 token ≈ 4 characters for English
-        estimated_tokens = len(content) // 4
+        # Rough token estimation: 1 token ≈ 4 characters for English, so the
+        # limit is checked on character length without estimating tokens
+        max_chars = self.max_doc_tokens * 4
+        content_length = len(content)
         
-        if estimated_tokens > self.max_doc_tokens:
-            # Truncate to max tokens while preserving structure
-            max_chars = self.max_doc_tokens * 4
-            truncated = content[:max_chars]
+        if content_length <= max_chars:
+            return content
             
-            # Try to truncate at sentence boundary
-            last_period = truncated.rfind('.')
-            if last_period > max_chars * 0.8:  # If sentence boundary is reasonably close
-                truncated = truncated[:last_period + 1]
-            
-            if self.logger:
-                self.logger.content_guard_check(
-                    url, "content_truncated", True,
-                    {"original_tokens": estimated_tokens, 
-                     "max_tokens": self.max_doc_tokens,
-                     "original_length": len(content),
-                     "truncated_length": len(truncated)}
-                )
-                
-            return truncated + f"\n\n[Content truncated at {self.max_doc_tokens} tokens]"
+        # Truncate to max tokens while preserving structure
+        truncated = content[:max_chars]
+        
+        # Try to truncate at a sentence (then line) boundary, searching only
+        # the last 20% of the slice where a cut is reasonably close
+        boundary_start = int(max_chars * 0.8) + 1
+        last_period = truncated.rfind('.', boundary_start)
+        if last_period != -1:
+            truncated = truncated[:last_period + 1]
+        else:
+            last_newline = truncated.rfind('\n', boundary_start)
+            if last_newline != -1:
+                truncated = truncated[:last_newline]
         
-        return content
+        if self.logger:
+            self.logger.content_guard_check(
+                url, "content_truncated", True,
+                {"original_tokens": content_length // 4, 
+                 "max_tokens": self.max_doc_tokens,
+                 "original_length": content_length,
+                 "truncated_length": len(truncated)}
+            )
+            
+        return truncated + f"\n\n[Content truncated at {self.max_doc_tokens} tokens]"
         
     def _check_robots_txt(self, domain: str, url: str) -> bool:
         """Check if URL is allowed by robots.txt.
@@ -154,58 +277,74 @@ class ContentGuard:
         Returns:
             True if allowed, False if blocked
         """
-        # Check cache first
-        cache_key = f"{domain}:robots"
-        if cache_key in self.robots_cache:
-            return self.robots_cache[cache_key]
-        
-        try:
-            robots_url = f"{domain}/robots.txt"
-            response = requests.get(robots_url, timeout=5)
+        disallowed_paths = self._get_cached_robots_rules(domain)
+        if disallowed_paths is None:
+            disallowed_paths = self._fetch_robots_rules(domain)
+            if disallowed_paths is None:
+                # No usable robots.txt: allow all, but retry sooner than a real file
+                disallowed_paths = ()
+                self._cache_robots_rules(domain, disallowed_paths, self.robots_negative_cache_ttl)
+            else:
+                self._cache_robots_rules(domain, disallowed_paths, self.robots_cache_ttl)
             
-            if response.status_code == 200:
-                robots_content = response.text
-                
-                # Simple robots.txt parsing for User-agent: *
-                lines = robots_content.split('\n')
-                current_user_agent = None
-                disallowed_paths = []
-                
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('User-agent:'):
-                        user_agent = line.split(':', 1)[1].strip()
-                        if user_agent == '*':
-                            current_user_agent = '*'
-                        else:
-                            current_user_agent = None
-                    elif line.startswith('Disallow:') and current_user_agent == '*':
-                        path = line.split(':', 1)[1].strip()
-                        if path:
-                            disallowed_paths.append(path)
-                
-                # Check if URL path is disallowed
-                parsed = urlparse(url)
-                url_path = parsed.path
-                
-                for disallowed_path in disallowed_paths:
-                    if url_path.startswith(disallowed_path):
-                        self.robots_cache[cache_key] = False
-                        return False
-                        
-                # Not explicitly disallowed
-                self.robots_cache[cache_key] = True
-                return True
+        # Check if URL path is disallowed; startswith tests all prefixes at once
+        return not urlparse(url).path.startswith(disallowed_paths)
+        
+    def _get_cached_robots_rules(self, domain: str) -> Optional[Tuple[str, ...]]:
+        """Get unexpired cached robots.txt rules, marking them recently used."""
+        with self._robots_lock:
+            entry = self.robots_cache.get(domain)
+            if entry is None:
+                return None
                 
-            else:
-                # No robots.txt or error accessing it - allow by default
-                self.robots_cache[cache_key] = True
-                return True
+            disallowed_paths, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self.robots_cache[domain]
+                return None
                 
+            self.robots_cache.move_to_end(domain)
+            return disallowed_paths
+        
+    def _cache_robots_rules(self, domain: str, disallowed_paths: Tuple[str, ...], ttl: float) -> None:
+        """Cache robots.txt rules for ``ttl`` seconds, evicting the least recently used domain."""
+        with self._robots_lock:
+            self.robots_cache[domain] = (disallowed_paths, time.monotonic() + ttl)
+            self.robots_cache.move_to_end(domain)
+            while len(self.robots_cache) > self.max_robots_cache_entries:
+                self.robots_cache.popitem(last=False)
+            
+    def _get_session(self) -> requests.Session:
+        """Get the pooled keep-alive session used for robots.txt fetches."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=50,
+                pool_maxsize=50,
+                max_retries=Retry(total=1, backoff_factor=0.1)
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+            self._session = session
+        return self._session
+        
+    def _fetch_robots_rules(self, domain: str) -> Optional[Tuple[str, ...]]:
+        """Fetch robots.txt and return the paths disallowed for ``User-agent: *``.
+        
+        Returns None when robots.txt is missing or unreadable (allow by default).
+        """
+        try:
+            robots_url = f"{domain}/robots.txt"
+            response = self._get_session().get(robots_url, timeout=5)
         except Exception:
             # Error checking robots.txt - allow by default but be conservative
-            self.robots_cache[cache_key] = True
-            return True
+            return None
+            
+        if response.status_code != 200:
+            # No robots.txt or error accessing it - allow by default
+            return None
+            
+        return _parse_disallowed_paths(response.text)
             
     def get_domain_stats(self) -> Dict[str, Dict[str, int]]:
         """Get statistics about domain usage.
@@ -213,8 +352,11 @@ class ContentGuard:
         Returns:
             Dict with domain stats
         """
+        with self._domains_guard:
+            domains = list(self._domains.items())
         stats = {}
-        for domain, count in self.domain_request_count.items():
+        for domain, state in domains:
+            count = state.request_count
             stats[domain] = {
                 'requests': count,
                 'remaining': max(0, self.max_docs_per_domain - count),
@@ -223,6 +365,6 @@ class ContentGuard:
         return stats
         
     def reset_domain_limits(self) -> None:
-        """Reset domain request counters."""
-        self.domain_request_count.clear()
-        self.domain_last_request.clear()
\ No newline at end of file
+        """Reset domain request counters and rate limit buckets."""
+        with self._domains_guard:
+            self._domains.clear()
\ No newline at end of file
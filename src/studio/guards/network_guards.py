@@ -1,10 +1,15 @@
 """Network security guards for offline mode enforcement."""
 
 import socket
+import threading
+from contextlib import contextmanager
+
 import urllib3
 
 
+# Reads of the flag are a plain global load; writes and patching are locked
 _offline_mode_enabled = False
+_offline_mode_lock = threading.Lock()
 _original_socket_create_connection = socket.create_connection
 _original_urllib3_request = None
 
@@ -17,22 +22,24 @@ def enforce_offline_mode(enabled: bool) -> None:
     """
     global _offline_mode_enabled, _original_urllib3_request
     
-    _offline_mode_enabled = enabled
-    
-    if enabled:
-        # Block socket connections
-        socket.create_connection = _blocked_create_connection
-        
-        # Block urllib3/requests
-        if hasattr(urllib3.poolmanager, 'PoolManager'):
-            if _original_urllib3_request is None:
-                _original_urllib3_request = urllib3.poolmanager.PoolManager.request
-            urllib3.poolmanager.PoolManager.request = _blocked_urllib3_request
-    else:
-        # Restore original functions
-        socket.create_connection = _original_socket_create_connection
-        if _original_urllib3_request is not None:
-            urllib3.poolmanager.PoolManager.request = _original_urllib3_request
+    with _offline_mode_lock:
+        if enabled:
+            # Block socket connections
+            socket.create_connection = _blocked_create_connection
+            
+            # Block urllib3/requests
+            if hasattr(urllib3.poolmanager, 'PoolManager'):
+                if _original_urllib3_request is None:
+                    _original_urllib3_request = urllib3.poolmanager.PoolManager.request
+                urllib3.poolmanager.PoolManager.request = _blocked_urllib3_request
+        else:
+            # Restore original functions
+            socket.create_connection = _original_socket_create_connection
+            if _original_urllib3_request is not None:
+                urllib3.poolmanager.PoolManager.request = _original_urllib3_request
+                
+        # Publish the flag only once the patches match it
+        _offline_mode_enabled = enabled
 
 
 def _blocked_create_connection(*args, **kwargs):
@@ -76,4 +83,14 @@ class NetworkGuard:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Exit context and restore previous offline mode state."""
         if self.enabled and not self.was_enabled:
-            enforce_offline_mode(False)
\ No newline at end of file
+            enforce_offline_mode(False)
+
+
+@contextmanager
+def offline_mode_context():
+    """Enable offline mode for the duration of a with block.
+    
+    Nested contexts leave offline mode enabled until the outermost one exits.
+    """
+    with NetworkGuard(enabled=True):
+        yield
@@ -1,14 +1,193 @@
 """Structured logging for RAG operations and runtime observability."""
 
+import atexit
+import json
 import logging
+import queue
 import sys
-from datetime import datetime
+import threading
+import weakref
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any
 from uuid import UUID
 
 import structlog
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Records are queued and written by a background thread per destination, so
+# callers never block on console or file I/O. RAGLoggers writing to the same
+# destination share one listener, which stops when the last of them closes.
+_DestinationKey = tuple[bool, Path | None]
+
+
+class _SharedQueueListener:
+    """Queue listener for one destination plus the levels of the loggers using it."""
+
+    def __init__(
+        self, logger: logging.Logger, handler: QueueHandler, listener: QueueListener
+    ):
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self.user_levels: list[int] = []
+
+    def update_level(self) -> None:
+        """Let the most verbose remaining user set the logger's level."""
+        if self.user_levels:
+            self.logger.setLevel(min(self.user_levels))
+
+
+_queue_listeners: dict[_DestinationKey, _SharedQueueListener] = {}
+_queue_lock = threading.Lock()
+
+
+def _acquire_queue_listener(
+    enable_console: bool, log_file: Path | None, level: int
+) -> tuple[_DestinationKey, logging.Logger]:
+    """Return a stdlib logger whose records a background listener writes out.
+
+    The listener for a destination is started on first use and reused by
+    later RAGLoggers with the same console setting and log file, so each
+    logger's records only reach its own file.
+    """
+    key = (enable_console, log_file.resolve() if log_file else None)
+
+    with _queue_lock:
+        shared = _queue_listeners.get(key)
+        if shared is None:
+            # Without the console, a log file is the only output; stderr is
+            # used only when there is no file to write to
+            handlers: list[logging.Handler] = []
+            if enable_console:
+                handlers.append(logging.StreamHandler(sys.stdout))
+            if log_file:
+                handlers.append(logging.FileHandler(str(log_file)))
+            elif not enable_console:
+                handlers.append(logging.StreamHandler(sys.stderr))
+
+            log_queue = queue.SimpleQueue()
+            # One logger per destination, outside the logging registry so every
+            # destination still reports its records under the "rag" name
+            logger = logging.Logger("rag")
+            logger.propagate = False
+            handler = QueueHandler(log_queue)
+            logger.addHandler(handler)
+            shared = _SharedQueueListener(
+                logger,
+                handler,
+                QueueListener(log_queue, *handlers, respect_handler_level=True),
+            )
+            shared.listener.start()
+            _queue_listeners[key] = shared
+
+        shared.user_levels.append(level)
+        shared.update_level()
+        return key, shared.logger
+
+
+def _release_queue_listener(key: _DestinationKey, level: int) -> None:
+    """Drop one user of a destination, flushing and stopping it after the last.
+
+    The remaining users' levels decide the logger's level again, so a closed
+    DEBUG logger does not leave the others paying for DEBUG records.
+    """
+    with _queue_lock:
+        shared = _queue_listeners.get(key)
+        if shared is None:
+            return
+        shared.user_levels.remove(level)
+        if shared.user_levels:
+            shared.update_level()
+        else:
+            del _queue_listeners[key]
+            _stop_shared_listener(shared)
+
+
+def _stop_queue_listeners() -> None:
+    """Flush and stop every listener; registered to run at exit."""
+    with _queue_lock:
+        while _queue_listeners:
+            _stop_shared_listener(_queue_listeners.popitem()[1])
+
+
+def _stop_shared_listener(shared: _SharedQueueListener) -> None:
+    shared.logger.removeHandler(shared.handler)
+
+    # stop() processes everything still queued before joining the thread
+    shared.listener.stop()
+    for handler in shared.listener.handlers:
+        handler.close()
+
+
+atexit.register(_stop_queue_listeners)
+
+
+class _NDJSONFileLogger:
+    """Writes records straight to a file as JSON lines, bypassing structlog.
+
+    Used for file-only logging. Each line carries the fields the structlog
+    processor chain would add (event, timestamp, level, logger, run_id), with
+    None values dropped, without running the chain per record. Debug and info
+    lines are buffered; warnings and errors flush the buffer so they reach
+    disk even if the process dies before close().
+    """
+
+    def __init__(self, log_file: Path, level: int, run_id: UUID | None):
+        self._level = level
+        self._run_id = str(run_id) if run_id else None
+        self._lock = threading.Lock()
+        self._file = open(log_file, "ab", buffering=1 << 16)
+        # Flush buffered lines if the logger is dropped or the process exits
+        self._finalizer = weakref.finalize(self, self._file.close)
+
+    def _write(
+        self, level_name: str, event: str, fields: dict[str, Any], flush: bool = False
+    ) -> None:
+        record = {k: v for k, v in fields.items() if v is not None}
+        record["event"] = event
+        record["timestamp"] = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+        record["level"] = level_name
+        record["logger"] = "rag"
+        if self._run_id:
+            record["run_id"] = self._run_id
+
+        if orjson is not None:
+            line = orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE)
+        else:
+            line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file.closed:
+                return  # Dropped after close(), like records sent to a stopped listener
+            self._file.write(line)
+            if flush:
+                self._file.flush()
+
+    def debug(self, event: str, **fields: Any) -> None:
+        if self._level <= logging.DEBUG:
+            self._write("debug", event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        if self._level <= logging.INFO:
+            self._write("info", event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        if self._level <= logging.WARNING:
+            self._write("warning", event, fields, flush=True)
+
+    def error(self, event: str, **fields: Any) -> None:
+        if self._level <= logging.ERROR:
+            self._write("error", event, fields, flush=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._finalizer()
+
 
 class RAGLogger:
     """Structured logger for RAG operations with configurable verbosity."""
@@ -24,29 +203,43 @@ class RAGLogger:
 
         Args:
             log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
-            enable_console: Whether to log to console
-            log_file: Optional file path for log output
+            enable_console: Whether to log to console (stdout)
+            log_file: Optional file path for log output. With the console
+                disabled, records go only to this file; without either they
+                go to stderr
             run_id: Optional run ID for correlation
         """
         self.run_id = run_id
         self.log_file = log_file
-        self._configure_logging(log_level, enable_console, log_file)
-        self.logger = structlog.get_logger("rag")
+        # Checked before building any event payload, so dropped records cost one compare
+        self._level = getattr(logging, log_level.upper())
+
+        if log_file and not enable_console and self._level > logging.DEBUG:
+            # File-only output needs no stdlib handlers or renderer; DEBUG keeps
+            # the structlog chain for its callsite fields
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            self.logger = _NDJSONFileLogger(log_file, self._level, run_id)
+        else:
+            self._configure_logging(log_level, enable_console, log_file)
 
     def _configure_logging(
         self, log_level: str, enable_console: bool, log_file: Path | None
     ) -> None:
         """Configure structlog with processors and outputs."""
 
+        level = getattr(logging, log_level.upper())
+
         # Configure stdlib logging
         logging.basicConfig(
             format="%(message)s",
             stream=sys.stdout if enable_console else None,
-            level=getattr(logging, log_level.upper()),
+            level=level,
         )
 
         # Define processors for structured logging
         processors = [
+            # Drop records below the logger's level before any other processing
+            structlog.stdlib.filter_by_level,
             # Add timestamp
             structlog.processors.TimeStamper(fmt="iso"),
             # Add log level
@@ -72,12 +265,9 @@ class RAGLogger:
                 )
             )
 
-        # Add file output if specified
+        # Create the log file's directory if specified
         if log_file:
             log_file.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(str(log_file))
-            file_handler.setLevel(getattr(logging, log_level.upper()))
-            processors.append(structlog.stdlib.ProcessorFormatter.wrap_for_formatter)
 
         # Add JSON formatter for structured output
         if enable_console:
@@ -94,6 +284,22 @@ class RAGLogger:
             cache_logger_on_first_use=True,
         )
 
+        self._listener_key, stdlib_logger = _acquire_queue_listener(
+            enable_console, log_file, level
+        )
+        self.logger = structlog.wrap_logger(stdlib_logger)
+
+    def close(self) -> None:
+        """Write out any queued log records and release the background writer.
+
+        The writer keeps running while other RAGLoggers share its destination.
+        """
+        if isinstance(self.logger, _NDJSONFileLogger):
+            self.logger.close()
+        elif self._listener_key is not None:
+            _release_queue_listener(self._listener_key, self._level)
+            self._listener_key = None
+
     def _add_run_id(
         self, logger: Any, method_name: str, event_dict: dict[str, Any]
     ) -> dict[str, Any]:
@@ -104,6 +310,8 @@ class RAGLogger:
 
     def search_started(self, query: str, engine: str, limit: int = None) -> None:
         """Log search operation start."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Search operation started",
             operation="search",
@@ -117,6 +325,8 @@ class RAGLogger:
         self, query: str, engine: str, results_count: int, duration_ms: int
     ) -> None:
         """Log search operation completion."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Search operation completed",
             operation="search",
@@ -132,6 +342,8 @@ class RAGLogger:
         self, query: str, engine: str, error: str, duration_ms: int
     ) -> None:
         """Log search operation failure."""
+        if self._level > logging.ERROR:
+            return
         self.logger.error(
             "Search operation failed",
             operation="search",
@@ -145,6 +357,8 @@ class RAGLogger:
 
     def web_fetch_started(self, url: str, user_agent: str = None) -> None:
         """Log web content fetch start."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Web fetch started",
             operation="web_fetch",
@@ -157,6 +371,8 @@ class RAGLogger:
         self, url: str, content_length: int, status_code: int, duration_ms: int
     ) -> None:
         """Log web content fetch completion."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Web fetch completed",
             operation="web_fetch",
@@ -172,6 +388,8 @@ class RAGLogger:
         self, url: str, error: str, status_code: int = None, duration_ms: int = None
     ) -> None:
         """Log web content fetch failure."""
+        if self._level > logging.ERROR:
+            return
         self.logger.error(
             "Web fetch failed",
             operation="web_fetch",
@@ -187,6 +405,8 @@ class RAGLogger:
         self, url: str, action: str, result: bool, details: dict[str, Any] = None
     ) -> None:
         """Log content guard checks."""
+        if self._level > (logging.INFO if result else logging.WARNING):
+            return
         log_func = self.logger.info if result else self.logger.warning
         log_func(
             "Content guard check",
@@ -200,6 +420,8 @@ class RAGLogger:
 
     def rate_limit_triggered(self, domain: str, delay_seconds: float) -> None:
         """Log rate limiting events."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Rate limit triggered",
             operation="rate_limit",
@@ -210,6 +432,8 @@ class RAGLogger:
 
     def embeddings_started(self, text_count: int, model_name: str = None) -> None:
         """Log embeddings generation start."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Embeddings generation started",
             operation="embeddings",
@@ -222,6 +446,8 @@ class RAGLogger:
         self, text_count: int, model_name: str, dimension: int, duration_ms: int
     ) -> None:
         """Log embeddings generation completion."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Embeddings generation completed",
             operation="embeddings",
@@ -241,6 +467,8 @@ class RAGLogger:
         duration_ms: int = None,
     ) -> None:
         """Log vector store operations."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Vector store operation",
             operation="vector_store",
@@ -253,6 +481,8 @@ class RAGLogger:
 
     def research_pipeline_started(self, spec_name: str, max_documents: int) -> None:
         """Log research pipeline start."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Research pipeline started",
             operation="research_pipeline",
@@ -265,6 +495,8 @@ class RAGLogger:
         self, spec_name: str, documents_found: int, total_duration_ms: int
     ) -> None:
         """Log research pipeline completion."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Research pipeline completed",
             operation="research_pipeline",
@@ -277,6 +509,8 @@ class RAGLogger:
 
     def agent_execution_started(self, agent_name: str, stage: str) -> None:
         """Log agent execution start."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Agent execution started",
             operation="agent_execution",
@@ -293,6 +527,8 @@ class RAGLogger:
         artifacts_count: int = 0,
     ) -> None:
         """Log agent execution completion."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Agent execution completed",
             operation="agent_execution",
@@ -312,6 +548,8 @@ class RAGLogger:
         size_bytes: int = None,
     ) -> None:
         """Log cache operations."""
+        if self._level > logging.DEBUG:
+            return
         self.logger.debug(
             "Cache operation",
             operation="cache",
@@ -331,6 +569,8 @@ class RAGLogger:
         context: dict[str, Any] = None,
     ) -> None:
         """Log performance metrics."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(
             "Performance metric",
             operation="performance",
@@ -345,6 +585,8 @@ class RAGLogger:
         self, message: str, error: Exception = None, context: dict[str, Any] = None
     ) -> None:
         """Log errors with context."""
+        if self._level > logging.ERROR:
+            return
         error_info = {}
         if error:
             error_info = {
@@ -358,14 +600,20 @@ class RAGLogger:
 
     def debug(self, message: str, **kwargs) -> None:
         """Log debug information."""
+        if self._level > logging.DEBUG:
+            return
         self.logger.debug(message, **kwargs)
 
     def info(self, message: str, **kwargs) -> None:
         """Log info level message."""
+        if self._level > logging.INFO:
+            return
         self.logger.info(message, **kwargs)
 
     def warning(self, message: str, **kwargs) -> None:
         """Log warning message."""
+        if self._level > logging.WARNING:
+            return
         self.logger.warning(message, **kwargs)
 
 
@@ -6,16 +6,15 @@ import yaml
 
 from .types import (
     AudienceMode,
-    Constraints,
     DevelopmentFlow,
     Dials,
-    Meta,
-    Problem,
     SourceSpec,
-    SuccessMetrics,
     TestDepth,
 )
 
+# libyaml's C loader parses the same safe subset several times faster
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class SpecBuilder:
     """Builds source specs from idea and decision files."""
@@ -33,14 +32,14 @@ class SpecBuilder:
         # Load idea if provided
         idea_data = {}
         if idea_path and idea_path.exists():
-            with open(idea_path) as f:
-                idea_data = yaml.safe_load(f) or {}
+            with open(idea_path, "rb") as f:
+                idea_data = yaml.load(f, Loader=_YAML_LOADER) or {}
 
         # Load decisions if provided
         decisions_data = {}
         if decisions_path and decisions_path.exists():
-            with open(decisions_path) as f:
-                decisions_data = yaml.safe_load(f) or {}
+            with open(decisions_path, "rb") as f:
+                decisions_data = yaml.load(f, Loader=_YAML_LOADER) or {}
 
         # Map decision data to Dials
         dials_data = {}
@@ -61,28 +60,28 @@ class SpecBuilder:
                 test_depth_value = "full_matrix"
             dials_data["test_depth"] = TestDepth(test_depth_value)
 
-        # Build spec from merged data
+        # Build spec from merged data; validated as one tree by pydantic-core
         spec_data = {
-            "meta": Meta(
-                name=idea_data.get("name", "Generated Spec"),
-                version="0.1.0",
-                description=idea_data.get("description")
-            ),
-            "problem": Problem(
-                statement=idea_data.get("problem_statement") or idea_data.get("problem", "Placeholder problem statement"),
-                context=idea_data.get("target_audience") or idea_data.get("context") or 
-                        (idea_data.get("audience", {}).get("use_context") if isinstance(idea_data.get("audience"), dict) else None)
-            ),
-            "success_metrics": SuccessMetrics(
-                metrics=self._extract_metrics(idea_data)
-            ),
-            "constraints": Constraints(
-                offline_ok=decisions_data.get("offline", False),  # Default to online for better RAG experience
-                budget_tokens=decisions_data.get("budget_tokens", 80000)
-            )
+            "meta": {
+                "name": idea_data.get("name", "Generated Spec"),
+                "version": "0.1.0",
+                "description": idea_data.get("description")
+            },
+            "problem": {
+                "statement": idea_data.get("problem_statement") or idea_data.get("problem", "Placeholder problem statement"),
+                "context": idea_data.get("target_audience") or idea_data.get("context") or 
+                           (idea_data.get("audience", {}).get("use_context") if isinstance(idea_data.get("audience"), dict) else None)
+            },
+            "success_metrics": {
+                "metrics": self._extract_metrics(idea_data)
+            },
+            "constraints": {
+                "offline_ok": decisions_data.get("offline", False),  # Default to online for better RAG experience
+                "budget_tokens": decisions_data.get("budget_tokens", 80000)
+            }
         }
 
-        spec = SourceSpec(**spec_data)
+        spec = SourceSpec.model_validate(spec_data)
         dials = Dials(**dials_data)
 
         return spec, dials
@@ -0,0 +1,36 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from click.testing import CliRunner
+
+from studio.adapters.embeddings import StubEmbeddingsAdapter
+from studio.app import StudioApp
+
+
+@pytest.fixture(scope="session")
+def app() -> StudioApp:
+    """Shared StudioApp so schema loading and wiring happen once per session."""
+    return StudioApp()
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """Shared Click test runner."""
+    return CliRunner()
+
+
+@pytest.fixture(scope="module")
+def stub_embeddings():
+    """Factory for shared stub embedding adapters, one per dimension.
+
+    The stub is deterministic and holds no state besides its dimension, so
+    tests that do not modify the adapter can share an instance.
+    """
+    adapters: dict[int, StubEmbeddingsAdapter] = {}
+
+    def get(dimension: int = 384) -> StubEmbeddingsAdapter:
+        if dimension not in adapters:
+            adapters[dimension] = StubEmbeddingsAdapter(dimension=dimension)
+        return adapters[dimension]
+
+    return get
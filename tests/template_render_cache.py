@@ -0,0 +1,148 @@
+"""Content-addressed render cache shared by the template test modules.
+
+Set ``STUDIO_RENDER_CACHE=0`` to bypass the cache and render every template
+live; the fresh output still refreshes the cache for later runs.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import jinja2
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+RENDER_CACHE_DIR = Path(tempfile.gettempdir()) / "studio-template-render-cache"
+
+# Least recently used entries beyond this count are pruned after each write
+RENDER_CACHE_MAX_ENTRIES = 256
+
+# Environment options that change rendered output
+_ENV_OPTIONS = (
+    "block_start_string",
+    "block_end_string",
+    "variable_start_string",
+    "variable_end_string",
+    "comment_start_string",
+    "comment_end_string",
+    "line_statement_prefix",
+    "line_comment_prefix",
+    "trim_blocks",
+    "lstrip_blocks",
+    "newline_sequence",
+    "keep_trailing_newline",
+    "autoescape",
+    "finalize",
+)
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("STUDIO_RENDER_CACHE", "1").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+def _canonical_json(data: dict[str, Any]) -> bytes:
+    """Serialize render data to sorted-key JSON bytes for hashing."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        )
+    return json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+
+
+def _callable_fingerprint(value: Any) -> str:
+    """Identify a filter, test or global, including its code when it is a Python function."""
+    code = getattr(value, "__code__", None)
+    if code is None:
+        if callable(value):
+            return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__qualname__)}"
+        return repr(value)
+    return f"{value.__module__}.{value.__qualname__}:{hashlib.blake2b(code.co_code, digest_size=8).hexdigest()}"
+
+
+def _env_fingerprint(env: jinja2.Environment) -> bytes:
+    """Hash the Environment settings that affect output: options, undefined policy, filters, tests and globals."""
+    parts = [
+        f"{option}={_callable_fingerprint(getattr(env, option))}"
+        for option in _ENV_OPTIONS
+    ]
+    parts.append(f"undefined={env.undefined.__module__}.{env.undefined.__qualname__}")
+    parts.append(f"extensions={sorted(env.extensions)}")
+    for label, mapping in (
+        ("filter", env.filters),
+        ("test", env.tests),
+        ("global", env.globals),
+    ):
+        parts.extend(
+            f"{label}:{name}={_callable_fingerprint(mapping[name])}"
+            for name in sorted(mapping)
+        )
+    return "\n".join(parts).encode("utf-8")
+
+
+def _render_key(env: jinja2.Environment, source: str, data: dict[str, Any]) -> str:
+    """Hash Jinja2 version, Environment config, template source and render data into a cache key."""
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(jinja2.__version__.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(_env_fingerprint(env))
+    digest.update(b"\0")
+    digest.update(source.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(_canonical_json(data))
+    return digest.hexdigest()
+
+
+def _prune_cache() -> None:
+    """Drop the least recently used entries once the cache exceeds its entry cap."""
+    entries = []
+    for entry in RENDER_CACHE_DIR.iterdir():
+        if entry.name.startswith("tmp"):
+            continue  # Another worker's in-progress write
+        try:
+            entries.append((entry.stat().st_mtime_ns, entry))
+        except OSError:
+            continue  # Removed by a concurrent worker
+    if len(entries) <= RENDER_CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, entry in entries[: len(entries) - RENDER_CACHE_MAX_ENTRIES]:
+        entry.unlink(missing_ok=True)
+
+
+def render_cached(env: jinja2.Environment, name: str, data: dict[str, Any]) -> str:
+    """Render a template, reusing output from earlier runs with identical inputs.
+
+    Rendering errors are never cached, so a broken template fails on every run.
+    """
+    source, _, _ = env.loader.get_source(env, name)
+    cache_file = RENDER_CACHE_DIR / _render_key(env, source, data)
+
+    if _cache_enabled() and cache_file.exists():
+        try:
+            rendered = cache_file.read_text(encoding="utf-8")
+            os.utime(cache_file)  # Mark as recently used for pruning
+            return rendered
+        except OSError:
+            pass  # Pruned by a concurrent worker; render below
+
+    rendered = env.get_template(name).render(data)
+
+    # Write to a temp file and rename so concurrent workers never see partial output
+    RENDER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=RENDER_CACHE_DIR)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(rendered)
+    os.replace(tmp_name, cache_file)
+    _prune_cache()
+
+    return rendered
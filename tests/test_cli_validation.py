@@ -2,11 +2,10 @@
 
 import json
 
-from click.testing import CliRunner
 from src.studio.cli import main
 
 
-def test_validate_valid_spec(tmp_path):
+def test_validate_valid_spec(runner, tmp_path):
     """Test validate command with valid spec."""
     # Create a valid spec file
     spec_data = {
@@ -19,7 +18,6 @@ def test_validate_valid_spec(tmp_path):
     with open(spec_file, 'w') as f:
         json.dump(spec_data, f)
 
-    runner = CliRunner()
     result = runner.invoke(main, ["validate", str(spec_file)])
 
     assert result.exit_code == 0
@@ -42,7 +40,7 @@ def test_validate_valid_spec(tmp_path):
     assert start_event["run_id"] == success_event["run_id"]  # Same run
 
 
-def test_validate_invalid_spec(tmp_path):
+def test_validate_invalid_spec(runner, tmp_path):
     """Test validate command with invalid spec."""
     # Create an invalid spec file (missing required meta field)
     spec_data = {
@@ -54,7 +52,6 @@ def test_validate_invalid_spec(tmp_path):
     with open(spec_file, 'w') as f:
         json.dump(spec_data, f)
 
-    runner = CliRunner()
     result = runner.invoke(main, ["validate", str(spec_file)])
 
     assert result.exit_code == 2
@@ -77,11 +74,10 @@ def test_validate_invalid_spec(tmp_path):
     assert error_event["details"]["error_type"] == "model_error"
 
 
-def test_validate_file_not_found(tmp_path):
+def test_validate_file_not_found(runner, tmp_path):
     """Test validate command with non-existent file."""
     nonexistent_file = tmp_path / "nonexistent.json"
 
-    runner = CliRunner()
     result = runner.invoke(main, ["validate", str(nonexistent_file)])
 
     assert result.exit_code == 2
@@ -101,13 +97,12 @@ def test_validate_file_not_found(tmp_path):
     assert error_event["details"]["error_type"] == "file_not_found"
 
 
-def test_validate_malformed_json(tmp_path):
+def test_validate_malformed_json(runner, tmp_path):
     """Test validate command with malformed JSON."""
     spec_file = tmp_path / "malformed.json"
     with open(spec_file, 'w') as f:
         f.write("{ invalid json")
 
-    runner = CliRunner()
     result = runner.invoke(main, ["validate", str(spec_file)])
 
     assert result.exit_code == 2
@@ -13,19 +13,21 @@ from studio.agents.base import (
 from studio.artifacts import Blackboard
 from studio.types import Dials, Meta, PackType, Problem, RunContext, SourceSpec, Status
 
+AGENT_CLASSES = [FramerAgent, PRDWriterAgent, DiagrammerAgent, QAArchitectAgent]
 
-@pytest.fixture
-def run_context(tmp_path):
-    """Create a test run context."""
+
+@pytest.fixture(scope="session")
+def run_context(tmp_path_factory):
+    """Create a test run context shared by the read-only agent tests."""
     return RunContext(
         run_id=uuid4(),
         offline=True,
         dials=Dials(),
-        out_dir=tmp_path
+        out_dir=tmp_path_factory.mktemp("agents")
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def source_spec():
     """Create a test source spec."""
     return SourceSpec(
@@ -36,13 +38,25 @@ def source_spec():
 
 @pytest.fixture
 def blackboard():
-    """Create a test blackboard."""
+    """Create a test blackboard; per test because agents write to it."""
     return Blackboard()
 
 
-def test_framer_agent(run_context, source_spec, blackboard):
+@pytest.fixture(scope="session")
+def agents():
+    """Shared agent instances keyed by class; these agents hold no run state."""
+    return {agent_cls: agent_cls() for agent_cls in AGENT_CLASSES}
+
+
+@pytest.fixture(params=AGENT_CLASSES, ids=lambda agent_cls: agent_cls.__name__)
+def agent(request, agents):
+    """Each shared agent instance in turn."""
+    return agents[request.param]
+
+
+def test_framer_agent(agents, run_context, source_spec, blackboard):
     """Test FramerAgent execution."""
-    agent = FramerAgent()
+    agent = agents[FramerAgent]
 
     assert agent.name == "FramerAgent"
 
@@ -63,9 +77,9 @@ def test_framer_agent(run_context, source_spec, blackboard):
         assert result.updated_spec.problem.context == "Generated context - needs manual review"
 
 
-def test_prd_writer_agent(run_context, source_spec, blackboard):
+def test_prd_writer_agent(agents, run_context, source_spec, blackboard):
     """Test PRDWriterAgent execution."""
-    agent = PRDWriterAgent()
+    agent = agents[PRDWriterAgent]
 
     result = agent.run(run_context, source_spec, blackboard)
 
@@ -75,9 +89,9 @@ def test_prd_writer_agent(run_context, source_spec, blackboard):
     assert result.artifacts[0].pack == PackType.BALANCED
 
 
-def test_diagrammer_agent(run_context, source_spec, blackboard):
+def test_diagrammer_agent(agents, run_context, source_spec, blackboard):
     """Test DiagrammerAgent execution."""
-    agent = DiagrammerAgent()
+    agent = agents[DiagrammerAgent]
 
     result = agent.run(run_context, source_spec, blackboard)
 
@@ -89,9 +103,9 @@ def test_diagrammer_agent(run_context, source_spec, blackboard):
     assert any("lifecycle" in name or "sequence" in name for name in diagram_names)
 
 
-def test_qa_architect_agent(run_context, source_spec, blackboard):
+def test_qa_architect_agent(agents, run_context, source_spec, blackboard):
     """Test QAArchitectAgent execution."""
-    agent = QAArchitectAgent()
+    agent = agents[QAArchitectAgent]
 
     result = agent.run(run_context, source_spec, blackboard)
 
@@ -101,12 +115,9 @@ def test_qa_architect_agent(run_context, source_spec, blackboard):
     assert "test_architecture_designed" in result.notes["action"]
 
 
-def test_agent_interface():
+def test_agent_interface(agent):
     """Test that agents follow the interface correctly."""
-    agents = [FramerAgent(), PRDWriterAgent(), DiagrammerAgent(), QAArchitectAgent()]
-
-    for agent in agents:
-        assert hasattr(agent, 'name')
-        assert hasattr(agent, 'run')
-        assert isinstance(agent.name, str)
-        assert agent.name.endswith('Agent')
+    assert hasattr(agent, 'name')
+    assert hasattr(agent, 'run')
+    assert isinstance(agent.name, str)
+    assert agent.name.endswith('Agent')
@@ -12,9 +12,8 @@ def test_studio_app_init():
     assert app.spec_builder is not None
 
 
-def test_validate_valid_spec():
+def test_validate_valid_spec(app):
     """Test validating a valid spec."""
-    app = StudioApp()
     spec = SourceSpec(
         meta=Meta(name="Test Spec", version="1.0.0"),
         problem=Problem(statement="Test problem")
@@ -25,9 +24,8 @@ def test_validate_valid_spec():
     assert len(result.errors) == 0
 
 
-def test_generate_from_spec(tmp_path):
+def test_generate_from_spec(app, tmp_path):
     """Test generating from a SourceSpec."""
-    app = StudioApp()
     spec = SourceSpec(
         meta=Meta(name="Test Spec", version="1.0.0"),
         problem=Problem(statement="Test problem")
@@ -45,10 +43,8 @@ def test_generate_from_spec(tmp_path):
     assert len(result.artifacts) > 0  # Should have some artifacts from stub agents
 
 
-def test_generate_from_files_missing_files(tmp_path):
+def test_generate_from_files_missing_files(app, tmp_path):
     """Test generating from missing files uses defaults."""
-    app = StudioApp()
-
     result = app.generate_from_files(
         idea_path=None,
         decisions_path=None,
@@ -61,10 +57,8 @@ def test_generate_from_files_missing_files(tmp_path):
     assert result.run_id is not None
 
 
-def test_package_artifacts():
+def test_package_artifacts(app):
     """Test packaging artifacts into zip."""
-    app = StudioApp()
-
     # Create a simple artifact index
     index = ArtifactIndex(
         run_id="12345678-1234-1234-1234-123456789012",
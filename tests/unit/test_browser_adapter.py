@@ -43,29 +43,34 @@ def test_playwright_browser_adapter_robots_txt_disallowed():
         adapter.fetch("https://example.com")
 
 
-def test_playwright_browser_adapter_rate_limiting():
+def test_playwright_browser_adapter_rate_limiting(monkeypatch):
     """Test PlaywrightBrowserAdapter applies rate limiting."""
-    import time
-    
-    adapter = PlaywrightBrowserAdapter(rate_limit_delay=0.1)
-    
-    # Mock the actual fetch to avoid network calls
-    def mock_fetch_without_rate_limit(url, offline_mode=False):
-        return HtmlContent(url=url, html="<html><body>Test</body></html>", 
-                          status_code=200, headers={})
-    
-    original_fetch = adapter.fetch
-    start_time = time.time()
-    
-    # Make multiple calls to the same domain
+    clock = [100.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr("studio.adapters.browser.time.monotonic", lambda: clock[0])
+    adapter = PlaywrightBrowserAdapter(rate_limit_delay=0.1, sleep=fake_sleep)
+
     domain = "https://example.com"
-    adapter._last_request_time[domain] = start_time - 0.05  # Recent request
-    
-    # This should apply rate limiting
+
+    # First request to a domain is not delayed
     adapter._apply_rate_limit(domain)
-    
-    elapsed = time.time() - start_time
-    assert elapsed >= 0.05  # Should have waited
+    assert sleeps == []
+
+    # A request 0.05s later must wait out the remainder of the interval
+    clock[0] += 0.05
+    adapter._apply_rate_limit(domain)
+    assert sleeps == [pytest.approx(0.05)]
+    assert adapter._last_request_time[domain] == pytest.approx(100.1)
+
+    # Once the interval has elapsed no sleep is needed
+    clock[0] += 0.2
+    adapter._apply_rate_limit(domain)
+    assert len(sleeps) == 1
 
 
 def test_playwright_browser_adapter_text_extraction():
@@ -1,7 +1,7 @@
 """Unit tests for CLI module."""
 
+import pytest
 import yaml
-from click.testing import CliRunner
 
 from studio.cli import CLIController, main
 
@@ -12,29 +12,21 @@ def test_cli_controller_init():
     assert controller.app is not None
 
 
-def test_cli_help():
-    """Test CLI help command."""
-    runner = CliRunner()
-    result = runner.invoke(main, ["--help"])
+@pytest.mark.parametrize(
+    "cmd",
+    [[], *([name] for name in sorted(main.commands))],
+    ids=lambda cmd: cmd[0] if cmd else "main",
+)
+def test_help(runner, cmd):
+    """Test CLI help for the main group and every registered subcommand."""
+    result = runner.invoke(main, [*cmd, "--help"])
     assert result.exit_code == 0
-    assert "Spec-to-Pack Studio CLI" in result.output
+    assert "Usage:" in result.output
+    if not cmd:
+        assert "Spec-to-Pack Studio CLI" in result.output
 
 
-def test_validate_command_help():
-    """Test validate command help."""
-    runner = CliRunner()
-    result = runner.invoke(main, ["validate", "--help"])
-    assert result.exit_code == 0
-
-
-def test_generate_command_help():
-    """Test generate command help."""
-    runner = CliRunner()
-    result = runner.invoke(main, ["generate", "--help"])
-    assert result.exit_code == 0
-
-
-def test_validate_with_valid_spec(tmp_path):
+def test_validate_with_valid_spec(runner, tmp_path):
     """Test validate command with valid spec."""
     # Create a minimal valid spec
     spec_data = {
@@ -46,16 +38,14 @@ def test_validate_with_valid_spec(tmp_path):
     with open(spec_file, 'w') as f:
         yaml.dump(spec_data, f)
 
-    runner = CliRunner()
     result = runner.invoke(main, ["validate", str(spec_file)])
 
     # Should validate successfully
     assert "PASS: Validation passed" in result.output
 
 
-def test_generate_dry_run():
+def test_generate_dry_run(runner):
     """Test generate command with dry run."""
-    runner = CliRunner()
     result = runner.invoke(main, ["generate", "--dry-run"])
 
     assert result.exit_code == 0
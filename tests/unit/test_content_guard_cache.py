@@ -0,0 +1,257 @@
+"""Tests for ContentGuard robots.txt caching and rate limiting."""
+
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from studio.guards import content_guards
+from studio.guards.content_guards import ContentGuard
+
+
+class FakeClock:
+    """Monotonic clock and sleep that only advance when told to."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class RecordingOrderedDict(OrderedDict):
+    """OrderedDict that records which keys were marked recently used."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.moved: list[str] = []
+
+    def move_to_end(self, key, last=True):
+        self.moved.append(key)
+        super().move_to_end(key, last)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the guard module's clock so cache expiry and waits are deterministic."""
+    fake = FakeClock()
+    monkeypatch.setattr(
+        content_guards,
+        "time",
+        SimpleNamespace(monotonic=fake.monotonic, sleep=fake.sleep),
+    )
+    return fake
+
+
+@pytest.fixture
+def robots_get(monkeypatch):
+    """Mocked requests.Session.get serving a robots.txt that disallows /private."""
+    get = Mock(
+        return_value=Mock(status_code=200, text="User-agent: *\nDisallow: /private\n")
+    )
+    monkeypatch.setattr(requests.Session, "get", get)
+    return get
+
+
+def fetched_domains(get: Mock) -> list[str]:
+    return [call.args[0] for call in get.call_args_list]
+
+
+class TestRobotsCache:
+    """Test the robots.txt LRU cache."""
+
+    def test_ttl_expiry_refetches(self, clock, robots_get):
+        """Test a cached robots.txt is reused until its TTL passes, then re-fetched."""
+        guard = ContentGuard(robots_cache_ttl=60)
+
+        assert guard.check_url_allowed("https://a.example/page")
+        with pytest.raises(ValueError, match="robots.txt"):
+            guard.check_url_allowed("https://a.example/private/page")
+        assert robots_get.call_count == 1
+
+        clock.advance(59)
+        guard.check_url_allowed("https://a.example/page")
+        assert robots_get.call_count == 1
+
+        clock.advance(1)
+        guard.check_url_allowed("https://a.example/page")
+        assert robots_get.call_count == 2
+
+    def test_least_recently_used_domain_evicted_at_cap(self, clock, robots_get):
+        """Test the cache keeps at most max_robots_cache_entries domains, dropping the LRU one."""
+        guard = ContentGuard(max_robots_cache_entries=2)
+
+        guard.check_url_allowed("https://a.example/")
+        guard.check_url_allowed("https://b.example/")
+        # Touch a so that b becomes the least recently used
+        guard.check_url_allowed("https://a.example/other")
+        guard.check_url_allowed("https://c.example/")
+
+        assert list(guard.robots_cache) == ["https://a.example", "https://c.example"]
+
+        guard.check_url_allowed("https://b.example/")
+        assert fetched_domains(robots_get) == [
+            "https://a.example/robots.txt",
+            "https://b.example/robots.txt",
+            "https://c.example/robots.txt",
+            "https://b.example/robots.txt",
+        ]
+
+    def test_cache_hit_marks_domain_recently_used(self, clock, robots_get):
+        """Test a cache hit moves the domain to the most recently used end."""
+        guard = ContentGuard()
+        guard.robots_cache = RecordingOrderedDict()
+
+        guard.check_url_allowed("https://a.example/")
+        guard.robots_cache.moved.clear()
+
+        guard.check_url_allowed("https://a.example/page")
+
+        assert guard.robots_cache.moved == ["https://a.example"]
+        assert robots_get.call_count == 1
+
+    @pytest.mark.parametrize("failure", ["error", "404"])
+    def test_failed_fetch_negatively_cached(self, clock, monkeypatch, failure):
+        """Test a failed robots.txt fetch is not retried until the negative TTL expires."""
+        if failure == "error":
+            failure = Mock(side_effect=requests.ConnectionError("unreachable"))
+        else:
+            failure = Mock(return_value=Mock(status_code=404, text=""))
+        monkeypatch.setattr(requests.Session, "get", failure)
+        guard = ContentGuard(robots_cache_ttl=3600, robots_negative_cache_ttl=300)
+
+        assert guard.check_url_allowed("https://a.example/private/page")
+        assert failure.call_count == 1
+
+        clock.advance(299)
+        assert guard.check_url_allowed("https://a.example/private/page")
+        assert failure.call_count == 1
+
+        clock.advance(1)
+        guard.check_url_allowed("https://a.example/private/page")
+        assert failure.call_count == 2
+
+    def test_concurrent_checks_of_expired_entry(self, clock, robots_get):
+        """Test threads hitting one expired entry at once re-fetch without KeyError."""
+        guard = ContentGuard(robots_cache_ttl=60)
+        guard.check_url_allowed("https://a.example/")
+        clock.advance(60)
+        barrier = threading.Barrier(8, timeout=5)
+        errors = []
+
+        def check():
+            barrier.wait()
+            try:
+                guard.check_url_allowed("https://a.example/page")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=check) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert list(guard.robots_cache) == ["https://a.example"]
+
+
+class TestRateLimit:
+    """Test the per-domain token bucket."""
+
+    def test_burst_of_one_keeps_minimum_gap(self, clock):
+        """Test the default burst spaces back-to-back requests rate_limit_delay apart."""
+        guard = ContentGuard(rate_limit_delay=2.0)
+
+        guard.check_rate_limit("https://a.example/1")
+        guard.check_rate_limit("https://a.example/2")
+        assert clock.sleeps == [pytest.approx(2.0)]
+
+        # The second request ran at its reserved slot, so the next is spaced from that
+        clock.advance(2.0)
+        guard.check_rate_limit("https://a.example/3")
+        assert clock.sleeps == [pytest.approx(2.0), pytest.approx(2.0)]
+
+        # Once a full delay has passed since the last slot, requests go straight through
+        clock.advance(4.0)
+        guard.check_rate_limit("https://a.example/4")
+        assert len(clock.sleeps) == 2
+
+    def test_burst_allows_back_to_back_requests(self, clock):
+        """Test burst=N lets N requests through without sleeping, then rate limits."""
+        guard = ContentGuard(rate_limit_delay=2.0, burst=3)
+
+        for page in range(3):
+            guard.check_rate_limit(f"https://a.example/{page}")
+        assert clock.sleeps == []
+
+        guard.check_rate_limit("https://a.example/3")
+        assert clock.sleeps == [pytest.approx(2.0)]
+
+        # Other domains have their own bucket
+        guard.check_rate_limit("https://b.example/")
+        assert clock.sleeps == [pytest.approx(2.0)]
+
+    def test_concurrent_reservations_queue_one_delay_apart(self, clock):
+        """Test concurrent callers reserve successive slots rather than sharing one."""
+        guard = ContentGuard(rate_limit_delay=2.0)
+        barrier = threading.Barrier(4, timeout=5)
+
+        def request():
+            barrier.wait()
+            guard.check_rate_limit("https://a.example/")
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # The clock never moves, so every caller after the first queues behind the
+        # slot reserved before it
+        assert sorted(clock.sleeps) == pytest.approx([2.0, 4.0, 6.0])
+
+
+class TestDomainCounts:
+    """Test per-domain fetch counting."""
+
+    def test_counts_and_reset(self):
+        """Test recorded fetches are counted per domain and cleared by reset_domain_limits."""
+        guard = ContentGuard(respect_robots_txt=False, max_docs_per_domain=2)
+
+        guard.record_successful_fetch("https://a.example/1")
+        guard.record_successful_fetch("https://a.example/2")
+        guard.record_successful_fetch("https://b.example/1")
+
+        assert dict(guard.domain_request_count) == {
+            "https://a.example": 2,
+            "https://b.example": 1,
+        }
+        assert guard.get_domain_stats()["https://a.example"]["remaining"] == 0
+        with pytest.raises(ValueError, match="Domain limit exceeded"):
+            guard.check_url_allowed("https://a.example/3")
+
+        guard.reset_domain_limits()
+
+        assert dict(guard.domain_request_count) == {}
+        assert guard.check_url_allowed("https://a.example/3")
+
+    def test_domain_request_count_is_read_only(self):
+        """Test writes to the count mapping fail loudly instead of being dropped."""
+        guard = ContentGuard(respect_robots_txt=False)
+        guard.record_successful_fetch("https://a.example/1")
+
+        with pytest.raises(TypeError):
+            guard.domain_request_count["https://a.example"] = 0
+
+        assert guard.domain_request_count["https://a.example"] == 1
@@ -25,6 +25,27 @@ def test_normalize_json():
     assert '"z_key"' in lines[-2]  # Last key before closing brace
 
 
+def test_normalize_json_custom_exclude_keys():
+    """Test that custom exclude keys drop top-level keys without mutating input."""
+    data = {"run_id": "abc", "name": "spec", "nested": {"run_id": "kept"}}
+
+    result = json.loads(DeterminismUtils.normalize_json(data, ["run_id"]))
+
+    assert result == {"name": "spec", "nested": {"run_id": "kept"}}
+    assert data["run_id"] == "abc"
+
+
+
+def test_normalize_json_matches_stdlib_for_floats():
+    """Test small floats and NaN serialize the same whichever extras are installed."""
+    data = {"score": 1e-5, "n": float("nan")}
+
+    result = DeterminismUtils.normalize_json(data)
+
+    assert result == json.dumps(data, sort_keys=True, indent=2, ensure_ascii=False)
+    assert '"score": 1e-05' in result
+    assert '"n": NaN' in result
+
 def test_ensure_lf_newlines():
     """Test newline normalization."""
     # Test CRLF to LF
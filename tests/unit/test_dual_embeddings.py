@@ -1,5 +1,9 @@
 """Tests for dual model embeddings adapter."""
 
+import os
+import subprocess
+import sys
+
 import pytest
 import numpy as np
 
@@ -9,6 +13,18 @@ from studio.adapters.embeddings import (
 )
 
 
+class FakeSentenceTransformer:
+    """Records encode calls and returns constant embeddings."""
+    
+    def __init__(self, dimension):
+        self.dimension = dimension
+        self.calls = []
+        
+    def encode(self, texts, **kwargs):
+        self.calls.append((list(texts), kwargs))
+        return np.ones((len(texts), self.dimension), dtype=np.float32)
+
+
 class TestDualModelEmbeddingsAdapter:
     """Test DualModelEmbeddingsAdapter."""
     
@@ -97,6 +113,63 @@ class TestDualModelEmbeddingsAdapter:
             assert isinstance(emb, list)
             assert len(emb) > 0
             
+    def test_batch_encoding_single_forward_pass(self):
+        """Test batch and single encodes share one batched model call each."""
+        adapter = DualModelEmbeddingsAdapter(batch_size=8)
+        adapter._query_model = FakeSentenceTransformer(384)
+        adapter._content_model = FakeSentenceTransformer(768)
+        
+        query_embeddings = adapter.encode_batch_queries(["q1", "q2", "q3"])
+        content_embedding = adapter.encode_content("c1")
+        
+        assert len(query_embeddings) == 3
+        assert all(len(emb) == 384 for emb in query_embeddings)
+        assert all(isinstance(x, float) for x in query_embeddings[0])
+        assert len(content_embedding) == 768
+        
+        assert len(adapter._query_model.calls) == 1
+        texts, kwargs = adapter._query_model.calls[0]
+        assert texts == ["q1", "q2", "q3"]
+        assert kwargs["batch_size"] == 8
+        assert kwargs["normalize_embeddings"] is True
+        assert adapter._content_model.calls[0][0] == ["c1"]
+        
+    def test_single_text_embeddings_cached(self):
+        """Test repeated single-text encodes reuse cached embeddings."""
+        adapter = DualModelEmbeddingsAdapter(embedding_cache_size=2)
+        adapter._query_model = FakeSentenceTransformer(384)
+        adapter._content_model = FakeSentenceTransformer(768)
+        
+        for content in ["passage one", "passage two", "passage one"]:
+            adapter.cross_similarity("shared query", content)
+            
+        assert len(adapter._query_model.calls) == 1
+        assert len(adapter._content_model.calls) == 2
+        
+        # Least recently used text is evicted once the cache is full
+        adapter.encode_content("passage three")
+        assert list(adapter._content_cache) == ["passage one", "passage three"]
+        
+    def test_encode_pair_batches(self):
+        """Test concurrent query/content batch encoding keeps results separate."""
+        adapter = DualModelEmbeddingsAdapter()
+        adapter._query_model = FakeSentenceTransformer(384)
+        adapter._content_model = FakeSentenceTransformer(768)
+        
+        query_embeddings, content_embeddings = adapter.encode_pair_batches(
+            ["q1", "q2"], ["c1", "c2", "c3"]
+        )
+        
+        assert [len(emb) for emb in query_embeddings] == [384, 384]
+        assert [len(emb) for emb in content_embeddings] == [768, 768, 768]
+        assert adapter._query_model.calls[0][0] == ["q1", "q2"]
+        assert adapter._content_model.calls[0][0] == ["c1", "c2", "c3"]
+        
+    def test_unknown_backend_rejected(self):
+        """Test that unsupported backends fail at construction time."""
+        with pytest.raises(ValueError, match="Unknown embeddings backend"):
+            DualModelEmbeddingsAdapter(backend="tensorrt")
+            
     def test_backward_compatibility(self):
         """Test backward compatibility with base adapter interface."""
         # Use stub for testing without requiring actual models
@@ -193,6 +266,24 @@ class TestEmbeddingsIntegration:
         assert different_emb != emb1
         assert len(different_emb) == 100
         
+    def test_stub_adapter_deterministic_across_processes(self):
+        """Test that stub embeddings do not depend on the per-process hash salt."""
+        script = (
+            "from studio.adapters.embeddings import StubEmbeddingsAdapter; "
+            "print(StubEmbeddingsAdapter(dimension=100).encode('consistent test text'))"
+        )
+        outputs = set()
+        for hash_seed in ("1", "2"):
+            env = {**os.environ, "PYTHONHASHSEED": hash_seed}
+            result = subprocess.run(
+                [sys.executable, "-c", script],
+                env=env, capture_output=True, text=True, check=True
+            )
+            outputs.add(result.stdout)
+            
+        expected = str(StubEmbeddingsAdapter(dimension=100).encode("consistent test text"))
+        assert outputs == {expected + "\n"}
+        
     def test_stub_batch_consistency(self):
         """Test stub adapter batch vs individual consistency."""
         adapter = StubEmbeddingsAdapter()
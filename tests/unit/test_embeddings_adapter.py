@@ -1,27 +1,49 @@
 """Tests for embeddings adapters."""
 
-import hashlib
+import sys
 
 import pytest
 
 from studio.adapters.embeddings import (
     BGEEmbeddingsAdapter,
     CachedEmbeddingsAdapter,
+    SemanticCachedEmbeddingsAdapter,
     StubEmbeddingsAdapter,
 )
 
 
-def test_stub_embeddings_adapter():
+class CaseInsensitiveProbe(StubEmbeddingsAdapter):
+    """Probe that maps texts differing only in case/spacing to one vector."""
+    
+    def encode_batch(self, texts):
+        return super().encode_batch([" ".join(text.lower().split()) for text in texts])
+
+
+def record_batches(adapter):
+    """Wrap ``adapter.encode_batch`` in place and return the list of texts per call."""
+    batches = []
+    original_encode_batch = adapter.encode_batch
+    
+    def recording_encode_batch(texts):
+        batches.append(list(texts))
+        return original_encode_batch(texts)
+        
+    adapter.encode_batch = recording_encode_batch
+    return batches
+
+
+def test_stub_embeddings_adapter(stub_embeddings):
     """Test stub embeddings adapter."""
-    adapter = StubEmbeddingsAdapter(dimension=128)
+    adapter = stub_embeddings(128)
     
     # Test single encoding
     text = "test text"
     embedding = adapter.encode(text)
     
     assert len(embedding) == 128
-    assert all(isinstance(val, float) for val in embedding)
-    assert all(-1.0 <= val <= 1.0 for val in embedding)
+    # Embeddings stay plain lists, so check them with C-level builtins
+    assert set(map(type, embedding)) == {float}
+    assert -1.0 <= min(embedding) and max(embedding) <= 1.0
     
     # Test deterministic behavior
     embedding2 = adapter.encode(text)
@@ -34,9 +56,9 @@ def test_stub_embeddings_adapter():
     assert adapter.dimension == 128
 
 
-def test_stub_embeddings_adapter_batch():
+def test_stub_embeddings_adapter_batch(stub_embeddings):
     """Test stub embeddings adapter batch encoding."""
-    adapter = StubEmbeddingsAdapter(dimension=64)
+    adapter = stub_embeddings(64)
     
     texts = ["text one", "text two", "text three"]
     embeddings = adapter.encode_batch(texts)
@@ -49,27 +71,29 @@ def test_stub_embeddings_adapter_batch():
     assert embeddings[1] != embeddings[2]
 
 
-def test_bge_embeddings_adapter_import_error():
+def test_stub_embeddings_adapter_batch_matches_single(stub_embeddings):
+    """Test vectorized batch encoding matches per-text encoding for any dimension."""
+    adapter = stub_embeddings(37)
+    
+    texts = ["alpha", "beta", ""]
+    assert adapter.encode_batch(texts) == [adapter.encode(text) for text in texts]
+    assert adapter.encode_batch([]) == []
+
+
+def test_bge_embeddings_adapter_import_error(monkeypatch):
     """Test BGEEmbeddingsAdapter handles missing dependencies."""
     adapter = BGEEmbeddingsAdapter()
     
-    # Mock missing import
-    import sys
-    original_modules = sys.modules.copy()
-    if 'sentence_transformers' in sys.modules:
-        del sys.modules['sentence_transformers']
+    # Mock missing import; a None entry makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, 'sentence_transformers', None)
     
-    try:
-        with pytest.raises(ImportError, match="sentence-transformers"):
-            adapter._load_model()
-    finally:
-        # Restore modules
-        sys.modules.update(original_modules)
+    with pytest.raises(ImportError, match="sentence-transformers"):
+        adapter._load_model()
 
 
-def test_cached_embeddings_adapter():
+def test_cached_embeddings_adapter(stub_embeddings):
     """Test cached embeddings adapter."""
-    base_adapter = StubEmbeddingsAdapter(dimension=32)
+    base_adapter = stub_embeddings(32)
     cached_adapter = CachedEmbeddingsAdapter(base_adapter, cache_size=2)
     
     # First encoding should call base adapter
@@ -90,19 +114,82 @@ def test_cached_embeddings_adapter():
     assert embedding1 != embedding2
     assert len(cached_adapter._cache) == 2
     
-    # Third text should evict oldest (FIFO)
+    # Third text should evict the least recently used entry
     text3 = "third text"
     embedding3 = cached_adapter.encode(text3)
     assert len(cached_adapter._cache) == 2
     
     # Original text1 should no longer be cached
-    text1_hash = hashlib.md5(text1.encode('utf-8')).hexdigest()
-    assert text1_hash not in cached_adapter._cache
+    assert text1 not in cached_adapter._cache
+    assert list(cached_adapter._cache) == [text2, text3]
+
+
+def test_cached_embeddings_adapter_lru_eviction(stub_embeddings):
+    """Test that cache hits protect entries from eviction."""
+    base_adapter = stub_embeddings(8)
+    cached_adapter = CachedEmbeddingsAdapter(base_adapter, cache_size=2)
+    
+    cached_adapter.encode("first text")
+    cached_adapter.encode("second text")
+    cached_adapter.encode("first text")  # Hit promotes first text
+    cached_adapter.encode("third text")
+    
+    assert list(cached_adapter._cache) == ["first text", "third text"]
+
+
+def test_semantic_cached_embeddings_adapter_near_duplicates():
+    """Test that near-duplicate texts are served from the semantic cache."""
+    pytest.importorskip("numpy")
+    
+    base_adapter = StubEmbeddingsAdapter(dimension=32)
+    batches = record_batches(base_adapter)
+    cached_adapter = SemanticCachedEmbeddingsAdapter(
+        base_adapter, CaseInsensitiveProbe(dimension=16), threshold=0.99, cache_size=2
+    )
+    
+    first = cached_adapter.encode("Hello World")
+    near_duplicate = cached_adapter.encode("hello   world ")
+    different = cached_adapter.encode("something else")
+    
+    assert near_duplicate == first
+    assert different != first
+    assert batches == [["Hello World"], ["something else"]]
+    assert cached_adapter.dimension == 32
+    
+    # The oldest entry is overwritten once the cache is full
+    cached_adapter.encode("third text")
+    assert "Hello World" not in cached_adapter._slots
 
 
-def test_cached_embeddings_adapter_batch():
+def test_semantic_cached_embeddings_adapter_batch_dedupes_near_duplicates():
+    """Test near-duplicate misses in one batch share a base encoding and are all stored."""
+    pytest.importorskip("numpy")
+    
+    base_adapter = StubEmbeddingsAdapter(dimension=32)
+    batches = record_batches(base_adapter)
+    probe_adapter = CaseInsensitiveProbe(dimension=16)
+    cached_adapter = SemanticCachedEmbeddingsAdapter(
+        base_adapter, probe_adapter, threshold=0.99, cache_size=8
+    )
+    
+    embeddings = cached_adapter.encode_batch(["Hello World", "other", "HELLO world"])
+    
+    assert batches == [["Hello World", "other"]]
+    assert embeddings[2] == embeddings[0]
+    assert set(cached_adapter._slots) == {"Hello World", "other", "HELLO world"}
+    
+    # A near-duplicate hit is stored under its own text, so repeating it is exact
+    probe_batches = record_batches(probe_adapter)
+    
+    assert cached_adapter.encode("hello WORLD") == embeddings[0]
+    assert cached_adapter.encode("hello WORLD") == embeddings[0]
+    assert probe_batches == [["hello WORLD"]]
+    assert len(batches) == 1
+
+
+def test_cached_embeddings_adapter_batch(stub_embeddings):
     """Test cached embeddings adapter batch processing."""
-    base_adapter = StubEmbeddingsAdapter(dimension=16)
+    base_adapter = stub_embeddings(16)
     cached_adapter = CachedEmbeddingsAdapter(base_adapter, cache_size=10)
     
     # Pre-populate cache with some texts
@@ -124,23 +211,36 @@ def test_cached_embeddings_adapter_batch():
     assert embeddings[2] == cached_adapter.encode("cached text 2")
 
 
-def test_cached_embeddings_dimension():
+def test_cached_embeddings_adapter_batch_encodes_misses_once():
+    """Test that only distinct cache misses reach the base adapter, in one batch."""
+    # Own instance rather than the shared fixture: encode_batch is wrapped below
+    base_adapter = StubEmbeddingsAdapter(dimension=16)
+    cached_adapter = CachedEmbeddingsAdapter(base_adapter, cache_size=10)
+    cached_adapter.encode("cached text")
+    batches = record_batches(base_adapter)
+    
+    texts = ["new text", "cached text", "new text", "other text"]
+    embeddings = cached_adapter.encode_batch(texts)
+    
+    assert batches == [["new text", "other text"]]
+    assert embeddings == [base_adapter.encode(text) for text in texts]
+
+
+def test_cached_embeddings_dimension(stub_embeddings):
     """Test cached embeddings adapter dimension property."""
-    base_adapter = StubEmbeddingsAdapter(dimension=256)
+    base_adapter = stub_embeddings(256)
     cached_adapter = CachedEmbeddingsAdapter(base_adapter)
     
     assert cached_adapter.dimension == 256
 
 
-def test_text_hash_generation():
-    """Test text hash generation for caching."""
-    base_adapter = StubEmbeddingsAdapter()
+def test_cache_keyed_on_text(stub_embeddings):
+    """Test that cache entries are keyed on the text itself."""
+    base_adapter = stub_embeddings()
     cached_adapter = CachedEmbeddingsAdapter(base_adapter)
     
-    hash1 = cached_adapter._get_text_hash("test text")
-    hash2 = cached_adapter._get_text_hash("test text")
-    hash3 = cached_adapter._get_text_hash("different text")
+    embedding = cached_adapter.encode("test text")
+    cached_adapter.encode_batch(["test text", "different text"])
     
-    assert hash1 == hash2
-    assert hash1 != hash3
-    assert len(hash1) == 32  # MD5 hex digest length
\ No newline at end of file
+    assert list(cached_adapter._cache) == ["test text", "different text"]
+    assert cached_adapter._cache["test text"] is embedding
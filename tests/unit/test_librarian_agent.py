@@ -1,12 +1,12 @@
 """Tests for LibrarianAgent."""
 
+import threading
 import uuid
 from pathlib import Path
 
 import pytest
 
-from studio.adapters.browser import StubBrowserAdapter
-from studio.adapters.embeddings import StubEmbeddingsAdapter
+from studio.adapters.browser import HtmlContent, StubBrowserAdapter
 from studio.adapters.vector_store import StubVectorStoreAdapter
 from studio.agents.base import LibrarianAgent
 from studio.artifacts import Blackboard
@@ -68,13 +68,18 @@ def test_librarian_agent_offline_mode(sample_spec, offline_run_context):
     assert result.notes["action"] == "skipped_research"
     assert result.notes["reason"] == "offline_mode"
     assert len(result.artifacts) == 0
+    
+    # No adapters are set up on the offline path
+    assert agent.browser_adapter is None
+    assert agent.vector_store_adapter is None
+    assert agent.cache_manager is None
 
 
-def test_librarian_agent_with_stub_adapters(sample_spec, run_context):
+def test_librarian_agent_with_stub_adapters(sample_spec, run_context, stub_embeddings):
     """Test LibrarianAgent with stub adapters."""
     browser_adapter = StubBrowserAdapter()
     vector_store_adapter = StubVectorStoreAdapter()
-    embeddings_adapter = StubEmbeddingsAdapter()
+    embeddings_adapter = stub_embeddings()
     
     agent = LibrarianAgent(
         browser_adapter=browser_adapter,
@@ -123,9 +128,9 @@ def test_librarian_agent_provenance_tracking(sample_spec, run_context):
         assert hasattr(doc.provenance, 'content_hash')
 
 
-def test_librarian_agent_embeddings_integration(sample_spec, run_context):
+def test_librarian_agent_embeddings_integration(sample_spec, run_context, stub_embeddings):
     """Test LibrarianAgent integrates embeddings correctly."""
-    embeddings_adapter = StubEmbeddingsAdapter(dimension=128)
+    embeddings_adapter = stub_embeddings(128)
     
     agent = LibrarianAgent(embeddings_model=embeddings_adapter)
     blackboard = Blackboard()
@@ -143,10 +148,10 @@ def test_librarian_agent_embeddings_integration(sample_spec, run_context):
             assert len(doc.embedding) == 128  # Stub dimension
 
 
-def test_librarian_agent_vector_store_indexing(sample_spec, run_context):
+def test_librarian_agent_vector_store_indexing(sample_spec, run_context, stub_embeddings):
     """Test LibrarianAgent indexes documents in vector store."""
     vector_store = StubVectorStoreAdapter()
-    embeddings_adapter = StubEmbeddingsAdapter()
+    embeddings_adapter = stub_embeddings()
     
     agent = LibrarianAgent(
         vector_store_adapter=vector_store,
@@ -197,6 +202,40 @@ def test_librarian_agent_max_documents_limit(sample_spec, run_context):
     assert result.notes["urls_processed"] <= 1
 
 
+def test_librarian_agent_concurrent_fetches_rate_limited(monkeypatch):
+    """Test concurrent fetches to one domain are spaced rate_limit_delay apart."""
+    # The clock never moves, so each fetch must wait behind every slot reserved before it
+    monkeypatch.setattr("studio.adapters.browser.time.monotonic", lambda: 100.0)
+    
+    class RateLimitedBrowserAdapter(StubBrowserAdapter):
+        """Stub that applies the base politeness delay like a network adapter."""
+        
+        def __init__(self):
+            super().__init__(rate_limit_delay=2.0, sleep=self.record_sleep)
+            self.current = threading.local()
+            self.waits = {}
+            
+        def record_sleep(self, seconds):
+            self.waits[self.current.url] = seconds
+            
+        def fetch(self, url: str, offline_mode: bool = False) -> HtmlContent:
+            self.current.url = url
+            self._apply_rate_limit(self._get_domain(url))
+            return super().fetch(url, offline_mode)
+            
+    browser = RateLimitedBrowserAdapter()
+    agent = LibrarianAgent(browser_adapter=browser)
+    urls = [f"https://example.com/doc{i}" for i in range(4)] + ["https://other.example/doc"]
+    
+    fetched = agent._fetch_all(urls, offline=False)
+    
+    assert list(fetched) == urls
+    assert all(content.status_code == 200 for content in fetched.values())
+    # One fetch per domain goes straight through; the rest queue one delay apart
+    assert sorted(browser.waits.values()) == pytest.approx([2.0, 4.0, 6.0])
+    assert all(url.startswith("https://example.com/") for url in browser.waits)
+
+
 def test_generate_research_urls():
     """Test URL generation from problem statement."""
     agent = LibrarianAgent()
@@ -3,6 +3,7 @@
 import socket
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pytest
@@ -16,6 +17,13 @@ from studio.guards.network_guards import (
 )
 
 
+@pytest.fixture(scope="module")
+def thread_pool():
+    """Worker threads shared by the concurrency tests in this module."""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        yield pool
+
+
 class TestOfflineGuard:
     """Test OfflineGuard."""
     
@@ -89,25 +97,21 @@ class TestOfflineGuard:
         # Should be disabled after exception
         assert not guard.is_enabled()
         
-    def test_thread_safety(self):
+    def test_thread_safety(self, thread_pool):
         """Test thread safety of enable/disable operations."""
         guard = OfflineGuard()
         results = []
+        # Every thread enables before any of them checks and disables
+        barrier = threading.Barrier(5, timeout=5)
         
         def toggle_guard():
             guard.enable()
-            time.sleep(0.01)  # Small delay
+            barrier.wait()
             results.append(guard.is_enabled())
             guard.disable()
             
         # Run multiple threads
-        threads = [threading.Thread(target=toggle_guard) for _ in range(5)]
-        
-        for thread in threads:
-            thread.start()
-            
-        for thread in threads:
-            thread.join()
+        list(thread_pool.map(lambda _: toggle_guard(), range(5)))
             
         # All threads should have seen the guard as enabled
         assert all(results)
@@ -343,7 +347,7 @@ class TestOfflineGuardErrorScenarios:
         # State should still be updated correctly
         assert not guard.is_enabled()
         
-    def test_concurrent_enable_disable(self):
+    def test_concurrent_enable_disable(self, thread_pool):
         """Test concurrent enable/disable operations."""
         guard = OfflineGuard()
         
@@ -355,14 +359,11 @@ class TestOfflineGuardErrorScenarios:
             guard.disable()
             
         # Run concurrent operations
-        enable_thread = threading.Thread(target=enable_worker)
-        disable_thread = threading.Thread(target=disable_worker)
-        
-        enable_thread.start()
-        disable_thread.start()
+        enable_future = thread_pool.submit(enable_worker)
+        disable_future = thread_pool.submit(disable_worker)
         
-        enable_thread.join()
-        disable_thread.join()
+        enable_future.result()
+        disable_future.result()
         
         # Final state should be consistent (disabled due to disable_worker)
         assert not guard.is_enabled()
@@ -1,11 +1,14 @@
 """Tests for RAG structured logging functionality."""
 
+import json
+import logging
 import tempfile
 from pathlib import Path
 from uuid import uuid4
 
 import pytest
 
+from studio import logging as rag_logging
 from studio.logging import RAGLogger, create_rag_logger
 
 
@@ -154,6 +157,150 @@ class TestRAGLogger:
             # Note: File creation depends on handler configuration
             # This test validates the logger accepts file parameter without error
             assert log_file.parent.exists()
+    
+    def test_file_logging_flushed_on_close(self):
+        """Test queued records reach the log file once the logger is closed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "test_rag.log"
+            logger = RAGLogger(
+                log_level="INFO",
+                enable_console=False,
+                log_file=log_file
+            )
+            
+            logger.info("Queued message", test_key="test_value")
+            logger.debug("Filtered message")
+            logger.close()
+            
+            content = log_file.read_text()
+            assert "Queued message" in content
+            assert "Filtered message" not in content
+            
+            record = json.loads(content.splitlines()[0])
+            assert record["event"] == "Queued message"
+            assert record["test_key"] == "test_value"
+            assert record["level"] == "info"
+            assert record["logger"] == "rag"
+    
+    def test_file_logging_flushes_warnings_before_close(self):
+        """Test warnings and errors reach disk without waiting for close()."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "test_rag.log"
+            logger = RAGLogger(
+                log_level="INFO",
+                enable_console=False,
+                log_file=log_file
+            )
+            
+            logger.info("Buffered message")
+            logger.warning("Warning message", risk="medium")
+            
+            events = [json.loads(line)["event"] for line in log_file.read_text().splitlines()]
+            assert events == ["Buffered message", "Warning message"]
+            
+            logger.error("Error message", ValueError("boom"))
+            
+            assert "Error message" in log_file.read_text()
+            logger.close()
+    
+    @pytest.mark.parametrize("level", ["DEBUG", "INFO"])
+    def test_file_only_logging_skips_stderr(self, level, capsys):
+        """Test a log file without the console is the only output at every level."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "test_rag.log"
+            logger = RAGLogger(log_level=level, enable_console=False, log_file=log_file)
+            
+            logger.warning(f"hello-{level}")
+            logger.close()
+            
+            assert f"hello-{level}" in log_file.read_text()
+            captured = capsys.readouterr()
+            assert f"hello-{level}" not in captured.err + captured.out
+    
+    def test_file_logging_after_close_dropped(self):
+        """Test records logged after close() are dropped instead of raising."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "test_rag.log"
+            logger = RAGLogger(log_level="INFO", enable_console=False, log_file=log_file)
+            logger.close()
+            
+            logger.info("Late message")
+            logger.error("Late error")
+            
+            assert "Late" not in log_file.read_text()
+    
+    def test_loggers_keep_separate_log_files(self):
+        """Test each logger's records reach only its own file, even after another closes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_file = Path(temp_dir) / "first.log"
+            second_file = Path(temp_dir) / "second.log"
+            # DEBUG keeps the structlog chain and its background queue listener
+            first = RAGLogger(log_level="DEBUG", enable_console=False, log_file=first_file)
+            second = RAGLogger(log_level="DEBUG", enable_console=False, log_file=second_file)
+            
+            first.info("First message")
+            second.info("Second message")
+            first.close()
+            second.info("Second after first closed")
+            second.close()
+            
+            assert "First message" in first_file.read_text()
+            assert "Second" not in first_file.read_text()
+            second_content = second_file.read_text()
+            assert "First message" not in second_content
+            assert "Second message" in second_content
+            assert "Second after first closed" in second_content
+    
+    def test_loggers_sharing_a_file_share_one_listener(self):
+        """Test closing one of two loggers on a file leaves the other writing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "shared.log"
+            first = RAGLogger(log_level="DEBUG", enable_console=False, log_file=log_file)
+            second = RAGLogger(log_level="DEBUG", enable_console=False, log_file=log_file)
+            
+            first.info("First message")
+            first.close()
+            first.close()  # Closing twice must not release the other logger's share
+            second.info("Second message")
+            second.close()
+            
+            lines = log_file.read_text().splitlines()
+            assert [json.loads(line)["event"] for line in lines] == ["First message", "Second message"]
+            assert all(json.loads(line)["logger"] == "rag" for line in lines)
+    
+    def test_shared_listener_level_follows_remaining_loggers(self):
+        """Test closing the most verbose logger on a file raises the shared level again."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "shared.log"
+            # The console keeps the INFO logger on the queue listener path too
+            verbose = RAGLogger(log_level="DEBUG", enable_console=True, log_file=log_file)
+            quiet = RAGLogger(log_level="INFO", enable_console=True, log_file=log_file)
+            shared = rag_logging._queue_listeners[quiet._listener_key]
+            
+            assert shared.logger.level == logging.DEBUG
+            verbose.close()
+            assert shared.logger.level == logging.INFO
+            quiet.close()
+            assert quiet._listener_key is None
+    
+    def test_helpers_below_level_not_written(self):
+        """Test structured helpers below the configured level emit nothing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "test_rag.log"
+            logger = RAGLogger(
+                log_level="WARNING",
+                enable_console=False,
+                log_file=log_file
+            )
+            
+            logger.search_started("test query", "duckduckgo", limit=5)
+            logger.cache_operation("get", "search_results", "test_key", hit=True)
+            logger.content_guard_check("https://blocked.com", "robots_txt", False)
+            logger.close()
+            
+            lines = log_file.read_text().splitlines()
+            assert len(lines) == 1
+            assert "Content guard check" in lines[0]
 
 
 class TestLoggingIntegration:
@@ -170,16 +317,16 @@ class TestLoggingIntegration:
         # Verify run_id is stored
         assert logger.run_id == run_id
     
-    def test_different_log_levels(self):
+    @pytest.mark.parametrize("level", ["DEBUG", "INFO", "WARNING", "ERROR"])
+    def test_different_log_levels(self, level):
         """Test different log levels."""
-        for level in ["DEBUG", "INFO", "WARNING", "ERROR"]:
-            logger = RAGLogger(log_level=level, enable_console=False)
-            
-            # Should not raise exceptions
-            logger.debug("Debug message")
-            logger.info("Info message") 
-            logger.warning("Warning message")
-            logger.error("Error message")
+        logger = RAGLogger(log_level=level, enable_console=False)
+        
+        # Should not raise exceptions
+        logger.debug("Debug message")
+        logger.info("Info message") 
+        logger.warning("Warning message")
+        logger.error("Error message")
     
     def test_logger_without_console(self):
         """Test logger with console disabled."""
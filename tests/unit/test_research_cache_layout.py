@@ -0,0 +1,56 @@
+"""Tests for the research cache on-disk layout."""
+
+from studio.cache.research_cache import CacheLevel, ResearchCacheManager
+
+
+def write_flat_layout_entry(cache_dir, cache_key):
+    """Write an entry where the layout without level directories kept it."""
+    old_entry = cache_dir / cache_key[:2] / cache_key[2:4] / f"{cache_key}.json"
+    old_entry.parent.mkdir(parents=True, exist_ok=True)
+    old_entry.write_text('{"data": {}}', encoding="utf-8")
+    return old_entry
+
+
+def test_entries_partitioned_by_level(tmp_path):
+    """Test entries are stored under their level's directory."""
+    cache = ResearchCacheManager(cache_dir=tmp_path)
+
+    assert cache.set(CacheLevel.SEARCH_RESULTS, "query", {"results": [1]})
+    assert cache.get(CacheLevel.SEARCH_RESULTS, "query") == {"results": [1]}
+
+    cache_key = cache._cache_key(CacheLevel.SEARCH_RESULTS, "query")
+    cache_path = cache._cache_path(CacheLevel.SEARCH_RESULTS, cache_key)
+    assert cache_path.is_relative_to(tmp_path / "search")
+
+
+def test_construction_leaves_flat_layout_entries(tmp_path):
+    """Test opening the cache never deletes anything."""
+    cache_key = "ab" * 32
+    old_entry = write_flat_layout_entry(tmp_path, cache_key)
+
+    ResearchCacheManager(cache_dir=tmp_path)
+
+    assert old_entry.exists()
+
+
+def test_migrate_layout_removes_only_flat_layout_entries(tmp_path):
+    """Test migrate_layout deletes old entry files and keeps everything else."""
+    cache = ResearchCacheManager(cache_dir=tmp_path)
+    cache.set(CacheLevel.EMBEDDINGS, "text", {"embedding": [0.5]})
+
+    cache_key = cache._cache_key(CacheLevel.SEARCH_RESULTS, "query")
+    write_flat_layout_entry(tmp_path, cache_key)
+    # Files in a hex-named directory that are not old cache entries
+    unrelated = tmp_path / "ab" / "cd" / "notes.json"
+    unrelated.parent.mkdir(parents=True)
+    unrelated.write_text("{}", encoding="utf-8")
+    misplaced = write_flat_layout_entry(tmp_path, "ab" * 32).rename(
+        tmp_path / "ab" / "cd" / f"{'ef' * 32}.json"
+    )
+
+    cache.migrate_layout()
+
+    assert not (tmp_path / cache_key[:2]).exists()
+    assert unrelated.exists()
+    assert misplaced.exists()
+    assert cache.get(CacheLevel.EMBEDDINGS, "text") == {"embedding": [0.5]}
@@ -0,0 +1,55 @@
+"""Tests for research cache entry serialization with and without orjson."""
+
+import json
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+
+from studio.cache import research_cache
+from studio.cache.research_cache import ResearchCacheManager
+from studio.types import ContentProvenance, ResearchDocument
+
+
+@pytest.fixture(params=["orjson", "json"])
+def serializer(request, monkeypatch):
+    """Run a test with orjson, when installed, and with the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(research_cache, "orjson", None)
+    return request.param
+
+
+def test_research_document_round_trip(tmp_path, serializer):
+    """Test research documents with datetimes are cached with either serializer."""
+    cache = ResearchCacheManager(cache_dir=tmp_path)
+    doc = ResearchDocument(
+        content="Cached content",
+        provenance=ContentProvenance(
+            source_url="https://example.com/doc",
+            retrieved_at=datetime(2025, 1, 2, 3, 4, 5, 678901),
+            chunk_id="chunk-1",
+        ),
+        embedding=[0.25, 0.5],
+    )
+
+    assert cache.cache_research_document(doc)
+    assert cache.get_research_document("https://example.com/doc") == doc
+
+
+def test_fallback_matches_orjson_for_native_types(monkeypatch):
+    """Test the stdlib fallback encodes datetimes, UUIDs and numpy values like orjson."""
+    pytest.importorskip("orjson")
+    np = pytest.importorskip("numpy")
+    entry = {
+        "naive": datetime(2025, 1, 2, 3, 4, 5, 678901),
+        "aware": datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC),
+        "id": UUID("12345678-1234-5678-1234-567812345678"),
+        "embedding": np.array([0.5, 1.5], dtype=np.float64),
+    }
+
+    with_orjson = research_cache._dump_entry(entry)
+    monkeypatch.setattr(research_cache, "orjson", None)
+
+    assert json.loads(research_cache._dump_entry(entry)) == json.loads(with_orjson)
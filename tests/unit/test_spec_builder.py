@@ -1,11 +1,37 @@
 """Unit tests for SpecBuilder."""
 
-import yaml
+import time
+
+import pytest
 
 from studio.spec_builder import SpecBuilder
 from studio.types import SourceSpec
 
 
+@pytest.fixture(scope="session")
+def idea_decisions_files(tmp_path_factory):
+    """Write the idea and decisions files once; SpecBuilder only reads them."""
+    spec_dir = tmp_path_factory.mktemp("specs")
+
+    idea_file = spec_dir / "idea.yaml"
+    idea_file.write_text(
+        "name: Test Feature\n"
+        "description: A test feature\n"
+        "problem: Users need to test things\n"
+    )
+
+    decisions_file = spec_dir / "decisions.yaml"
+    decisions_file.write_text(
+        "offline: false\n"
+        "budget_tokens: 50000\n"
+        "audience_mode: deep\n"
+        "development_flow: kanban\n"
+        "test_depth: full_matrix\n"
+    )
+
+    return idea_file, decisions_file
+
+
 def test_spec_builder_init():
     """Test SpecBuilder initialization."""
     builder = SpecBuilder()
@@ -26,29 +52,9 @@ def test_merge_idea_decisions_no_files():
     assert isinstance(dials, Dials)
 
 
-def test_merge_idea_decisions_with_files(tmp_path):
+def test_merge_idea_decisions_with_files(idea_decisions_files):
     """Test merging with idea and decision files."""
-    # Create idea file
-    idea_data = {
-        "name": "Test Feature",
-        "description": "A test feature",
-        "problem": "Users need to test things"
-    }
-    idea_file = tmp_path / "idea.yaml"
-    with open(idea_file, 'w') as f:
-        yaml.dump(idea_data, f)
-
-    # Create decisions file
-    decisions_data = {
-        "offline": False,
-        "budget_tokens": 50000,
-        "audience_mode": "deep",
-        "development_flow": "kanban",
-        "test_depth": "full_matrix"
-    }
-    decisions_file = tmp_path / "decisions.yaml"
-    with open(decisions_file, 'w') as f:
-        yaml.dump(decisions_data, f)
+    idea_file, decisions_file = idea_decisions_files
 
     # Merge files
     builder = SpecBuilder()
@@ -69,6 +75,25 @@ def test_merge_idea_decisions_with_files(tmp_path):
     assert dials.test_depth.value == "full_matrix"
 
 
+def test_merge_idea_decisions_perf(idea_decisions_files):
+    """Test merging stays within its per-call time budget."""
+    idea_file, decisions_file = idea_decisions_files
+
+    builder = SpecBuilder()
+    timings = []
+    for _ in range(20):
+        start_time = time.perf_counter()
+        spec, _dials = builder.merge_idea_decisions(idea_file, decisions_file)
+        timings.append(time.perf_counter() - start_time)
+
+    assert spec.meta.name == "Test Feature"
+
+    # Best-of-rounds filters scheduler noise; a merge takes ~1ms, so this
+    # only trips on a real regression in the load/validate path
+    best_time = min(timings)
+    assert best_time < 0.05, f"merge_idea_decisions too slow: {best_time * 1000:.1f}ms"
+
+
 def test_merge_with_missing_files(tmp_path):
     """Test merging with non-existent files."""
     nonexistent_file = tmp_path / "missing.yaml"
@@ -1,8 +1,7 @@
 """Tests for vector store adapters."""
 
 import json
-import tempfile
-from pathlib import Path
+import sys
 
 import pytest
 
@@ -14,6 +13,12 @@ from studio.adapters.vector_store import (
 )
 
 
+@pytest.fixture(scope="module")
+def lancedb_dir(tmp_path_factory):
+    """Temporary directory for LanceDB databases, created once per module."""
+    return tmp_path_factory.mktemp("lancedb")
+
+
 def test_stub_vector_store_adapter():
     """Test stub vector store adapter."""
     adapter = StubVectorStoreAdapter()
@@ -25,10 +30,10 @@ def test_stub_vector_store_adapter():
     assert len(adapter._documents) == 1
     assert "doc1" in adapter._documents
     
-    doc = adapter._documents["doc1"]
-    assert doc["embedding"] == embedding
-    assert doc["content"] == "test content"
-    assert doc["metadata"]["key"] == "value"
+    row = adapter._documents["doc1"]
+    assert adapter._embeddings[row] == embedding
+    assert adapter._contents[row] == "test content"
+    assert adapter._metadata[row]["key"] == "value"
     
     # Test searching
     results = adapter.search([0.1, 0.2, 0.3], k=5)
@@ -38,7 +43,7 @@ def test_stub_vector_store_adapter():
     assert isinstance(result, SearchResult)
     assert result.id == "doc1"
     assert result.content == "test content"
-    assert result.score == 0.85
+    assert result.score == pytest.approx(0.14)
     assert result.metadata["key"] == "value"
     
     # Test close (no-op for stub)
@@ -56,78 +61,100 @@ def test_stub_vector_store_adapter_multiple_documents():
         ("doc3", [0.5, 0.6], "content 3", {"type": "doc"}),
     ]
     
-    for doc_id, embedding, content, metadata in docs:
-        adapter.index(doc_id, embedding, content, metadata)
+    doc_ids, embeddings, contents, metadatas = map(list, zip(*docs, strict=True))
+    adapter.index_many(doc_ids, embeddings, contents, metadatas)
     
     assert len(adapter._documents) == 3
+    assert adapter._documents["doc2"] == 1
     
     # Test limited search results
     results = adapter.search([0.0, 0.0], k=2)
     assert len(results) == 2
+    
+    # Results are ranked by dot product with the query
+    results = adapter.search([1.0, 1.0], k=2)
+    assert [result.id for result in results] == ["doc3", "doc2"]
+    assert [result.score for result in results] == pytest.approx([1.1, 0.7])
+    
+    # Re-indexing an id replaces the document in place
+    adapter.index("doc1", [1.0, 1.0], "content 1b", {"type": "doc"})
+    assert len(adapter._documents) == 3
+    assert adapter.search([1.0, 1.0], k=1)[0].content == "content 1b"
+    
+    # Documents indexed after a search are scored by the next one
+    adapter.index("doc4", [2.0, 2.0], "content 4", {"type": "doc"})
+    results = adapter.search([1.0, 1.0], k=2)
+    assert [result.id for result in results] == ["doc4", "doc1"]
+    assert [result.score for result in results] == pytest.approx([4.0, 2.0])
 
 
-def test_lancedb_vector_store_adapter_import_error():
-    """Test LanceDBVectorStoreAdapter handles missing dependencies."""
-    adapter = LanceDBVectorStoreAdapter()
+def test_stub_vector_store_adapter_index_many_replaces_existing():
+    """Test batched indexing updates known ids in place and checks lengths."""
+    adapter = StubVectorStoreAdapter()
+    adapter.index("doc1", [0.1, 0.2], "content 1")
     
-    # Mock missing import
-    import sys
-    original_modules = sys.modules.copy()
-    if 'lancedb' in sys.modules:
-        del sys.modules['lancedb']
+    adapter.index_many(["doc1", "doc2"], [[1.0, 1.0], [0.3, 0.4]], ["content 1b", "content 2"])
     
-    try:
-        with pytest.raises(ImportError, match="lancedb"):
-            adapter._get_db()
-    finally:
-        # Restore modules
-        sys.modules.update(original_modules)
+    assert len(adapter._documents) == 2
+    assert adapter._contents[adapter._documents["doc1"]] == "content 1b"
+    assert adapter._metadata[adapter._documents["doc2"]] == {}
+    assert adapter.search([1.0, 1.0], k=1)[0].id == "doc1"
+    
+    with pytest.raises(ValueError, match="index_many"):
+        adapter.index_many(["doc3", "doc4"], [[0.5, 0.6]])
+
+
+def test_stub_vector_store_adapter_float32_arrays():
+    """Test the stub accepts float32 arrays for embeddings and queries."""
+    np = pytest.importorskip("numpy")
+    adapter = StubVectorStoreAdapter()
+    
+    adapter.index("doc1", np.array([0.1, 0.2], dtype=np.float32), "content 1")
+    adapter.index_many(["doc2", "doc3"], np.array([[0.3, 0.4], [0.5, 0.6]], dtype=np.float32), ["content 2", "content 3"])
+    
+    results = adapter.search(np.ones(2, dtype=np.float32), k=2)
+    assert [result.id for result in results] == ["doc3", "doc2"]
+    assert [result.score for result in results] == pytest.approx([1.1, 0.7])
 
 
-def test_lancedb_vector_store_adapter_basic():
+def test_lancedb_vector_store_adapter_basic(lancedb_dir):
     """Test LanceDBVectorStoreAdapter basic functionality."""
-    # Use temporary directory for test database
-    with tempfile.TemporaryDirectory() as temp_dir:
-        db_path = Path(temp_dir) / "test_db"
-        adapter = LanceDBVectorStoreAdapter(str(db_path))
-        
-        # Test with stub data (will fail gracefully without actual LanceDB)
-        embedding = [0.1, 0.2, 0.3, 0.4]
-        metadata = {
-            "source_url": "https://example.com",
-            "retrieved_at": "2023-01-01T00:00:00Z",
-            "chunk_id": "chunk-123",
-            "content_hash": "abc123"
-        }
-        
-        try:
-            adapter.index("doc1", embedding, "test content", metadata)
-            results = adapter.search(embedding, k=1)
-            # If we get here, LanceDB is available
-            assert isinstance(results, list)
-        except ImportError:
-            # Expected if LanceDB not installed
-            pass
-        
-        adapter.close()
-
-
-def test_qdrant_vector_store_adapter_import_error():
-    """Test QdrantVectorStoreAdapter handles missing dependencies."""
-    adapter = QdrantVectorStoreAdapter()
+    adapter = LanceDBVectorStoreAdapter(str(lancedb_dir / "test_db"))
     
-    # Mock missing import
-    import sys
-    original_modules = sys.modules.copy()
-    if 'qdrant_client' in sys.modules:
-        del sys.modules['qdrant_client']
+    # Test with stub data (will fail gracefully without actual LanceDB)
+    embedding = [0.1, 0.2, 0.3, 0.4]
+    metadata = {
+        "source_url": "https://example.com",
+        "retrieved_at": "2023-01-01T00:00:00Z",
+        "chunk_id": "chunk-123",
+        "content_hash": "abc123"
+    }
     
     try:
-        with pytest.raises(ImportError, match="qdrant-client"):
-            adapter._get_client()
-    finally:
-        # Restore modules
-        sys.modules.update(original_modules)
+        adapter.index("doc1", embedding, "test content", metadata)
+        results = adapter.search(embedding, k=1)
+        # If we get here, LanceDB is available
+        assert isinstance(results, list)
+    except ImportError:
+        # Expected if LanceDB not installed
+        pass
+    
+    adapter.close()
+
+
+@pytest.mark.parametrize("adapter_cls,missing_module,getter,match", [
+    (LanceDBVectorStoreAdapter, "lancedb", "_get_db", "lancedb"),
+    (QdrantVectorStoreAdapter, "qdrant_client", "_get_client", "qdrant-client"),
+], ids=["lancedb", "qdrant"])
+def test_vector_store_adapter_import_error(monkeypatch, adapter_cls, missing_module, getter, match):
+    """Test vector store adapters handle missing dependencies."""
+    adapter = adapter_cls()
+    
+    # A None entry makes the import fail; monkeypatch restores just this key
+    monkeypatch.setitem(sys.modules, missing_module, None)
+    
+    with pytest.raises(ImportError, match=match):
+        getattr(adapter, getter)()
 
 
 def test_qdrant_vector_store_adapter_basic():